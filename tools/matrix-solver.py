@@ -1,11 +1,36 @@
+import argparse
+import json
+import math
+from fractions import Fraction
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import os
 import sys
 import time
+import warnings
+
+try:
+    from scipy import linalg as scipy_linalg
+except ImportError:  # Factorization falls back to NumPy-only routines
+    scipy_linalg = None
+
+try:
+    from scipy import sparse
+    from scipy.sparse import linalg as sparse_linalg
+except ImportError:  # Sparse mode is unavailable without SciPy
+    sparse = sparse_linalg = None
 
 # --- Configuration ---
 PRECISION_DISPLAY = 4 
 ZERO_THRESHOLD = 1e-10
+RENDER_MAX_ROWS = 40     # Larger matrices are shown as corners around ⋮ / ⋯
+RENDER_MAX_COLS = 20
+RENDER_EDGE_ITEMS = 5    # Rows/cols kept on each side when truncating
+OOC_TILE = 2048          # Out-of-core tile edge; each thread holds ~3 tiles
+EXACT_MODULAR_MIN_SIZE = 40  # Exact mode: 'auto' switches from Bareiss to CRT at this size
+COND_WARNING = 1e10      # Warn when the estimated 1-norm condition number exceeds this
+MIXED_PRECISION_MAX_COND = 1e7  # Beyond this float32 refinement converges too slowly
 
 class Colors:
     HEADER = '\033[95m'
@@ -18,21 +43,417 @@ class Colors:
     BOLD = '\033[1m'
     ITALIC = '\033[3m'
 
+# --- 📂 FILE INPUT / OUTPUT ---
+
+MATRIX_FORMATS = (".npy", ".npz", ".csv", ".txt", ".mtx")
+
+def _read_matrix_market(path):
+    """Parse a Matrix Market file into (shape, rows, cols, values), 0-based.
+
+    Dense 'array' files come back in the same coordinate form. Symmetric,
+    skew-symmetric and Hermitian files are expanded to the full matrix.
+    """
+    with open(path, "rb") as f:
+        header = f.readline().decode().split()
+        if len(header) != 5 or header[0].lower() != "%%matrixmarket" or header[1].lower() != "matrix":
+            raise ValueError(f"{path}: not a Matrix Market matrix file")
+        layout, field, symmetry = (h.lower() for h in header[2:])
+        line = f.readline()
+        while line.startswith(b"%") or not line.strip():
+            line = f.readline()
+        size = [int(t) for t in line.split()]
+        # One split of the whole body beats a per-line parser by a wide margin
+        tokens = f.read().split()
+    if field not in ("real", "double", "integer", "pattern", "complex"):
+        raise ValueError(f"{path}: unsupported field '{field}'")
+    m, n = size[0], size[1]
+    width = {"pattern": 0, "complex": 2}.get(field, 1)
+
+    if layout == "coordinate":
+        nnz = size[2]
+        table = np.array(tokens, dtype=np.float64).reshape(nnz, 2 + width)
+        rows = table[:, 0].astype(np.int64) - 1
+        cols = table[:, 1].astype(np.int64) - 1
+        if field == "pattern":
+            vals = np.ones(nnz)
+        elif field == "complex":
+            vals = table[:, 2] + 1j * table[:, 3]
+        else:
+            vals = table[:, 2]
+    elif layout == "array":
+        if field == "pattern":
+            raise ValueError(f"{path}: 'pattern' needs coordinate layout")
+        flat = np.array(tokens, dtype=np.float64)
+        if field == "complex":
+            flat = flat[0::2] + 1j * flat[1::2]
+        # Column-major; symmetric files store only the lower triangle
+        if symmetry == "general":
+            cols, rows = np.divmod(np.arange(m * n), m)
+        else:
+            rows, cols = np.tril_indices(n)
+            order = np.lexsort((rows, cols))
+            rows, cols = rows[order], cols[order]
+            if symmetry == "skew-symmetric":
+                keep = rows != cols
+                rows, cols = rows[keep], cols[keep]
+        vals = flat
+    else:
+        raise ValueError(f"{path}: unknown layout '{layout}'")
+
+    if symmetry != "general":
+        off = rows != cols
+        mirrored = vals[off]
+        if symmetry == "skew-symmetric":
+            mirrored = -mirrored
+        elif symmetry == "hermitian":
+            mirrored = np.conj(mirrored)
+        rows, cols = np.concatenate([rows, cols[off]]), np.concatenate([cols, rows[off]])
+        vals = np.concatenate([vals, mirrored])
+    if field == "integer":
+        vals = vals.astype(np.int64)
+    return (m, n), rows, cols, vals
+
+def load_matrix(path, key=None):
+    """Load a matrix from .npy (memory-mapped), .npz, CSV/TXT or Matrix Market (.mtx)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        return np.load(path, mmap_mode="r")
+    if ext == ".npz":
+        with np.load(path) as archive:
+            if key is None:
+                if len(archive.files) != 1:
+                    raise ValueError(f"{path} holds {archive.files}; pick one with --key")
+                key = archive.files[0]
+            return archive[key]
+    if ext in (".csv", ".txt"):
+        return np.loadtxt(path, delimiter="," if ext == ".csv" else None, ndmin=2)
+    if ext == ".mtx":
+        shape, rows, cols, vals = _read_matrix_market(path)
+        dense = np.zeros(shape, dtype=vals.dtype)
+        # add.at sums duplicate entries, as Matrix Market readers are expected to
+        np.add.at(dense, (rows, cols), vals)
+        return dense
+    raise ValueError(f"Unsupported matrix file '{path}' (use {', '.join(MATRIX_FORMATS)})")
+
+def load_sparse_matrix(path):
+    """Load a matrix as SciPy CSR: Matrix Market, scipy.sparse .npz, or any dense format."""
+    if sparse is None:
+        raise ImportError("sparse mode needs scipy: pip install scipy")
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".mtx":
+        shape, rows, cols, vals = _read_matrix_market(path)
+        # COO -> CSR sums duplicate entries
+        return sparse.coo_matrix((vals, (rows, cols)), shape=shape).tocsr()
+    if ext == ".npz":
+        with np.load(path) as archive:
+            is_sparse = "format" in archive.files
+        if is_sparse:
+            return sparse.load_npz(path).tocsr()
+    return sparse.csr_matrix(load_matrix(path))
+
+def _float_list(value):
+    """value.tolist() with NaN/inf replaced by None, since JSON has no such numbers."""
+    if value.dtype.kind == "f" and not np.all(np.isfinite(value)):
+        value = value.astype(object)
+        value[~np.isfinite(value.astype(float))] = None
+    return value.tolist()
+
+def _jsonable(value):
+    """Convert NumPy results to JSON types; complex values become {"real", "imag"}.
+
+    Exact Fractions become "p/q" strings so no precision is lost, and NaN/inf
+    (e.g. singular batch items) become null.
+    """
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, Fraction):
+        return str(value)
+    value = np.asarray(value)
+    if value.dtype == object:
+        return np.vectorize(lambda v: str(v) if isinstance(v, Fraction) else v, otypes=[object])(value).tolist()
+    if np.iscomplexobj(value):
+        if not np.any(value.imag):
+            value = value.real
+        else:
+            return {"real": _float_list(value.real), "imag": _float_list(value.imag)}
+    return _float_list(value)
+
+def write_results(results, fmt="json", output=None):
+    """Write {op: result} as JSON, or as .npy (one array) / .npz (several) for fmt='npy'."""
+    if fmt == "json":
+        text = json.dumps(_jsonable(results), indent=2, allow_nan=False) + "\n"
+        if output:
+            with open(output, "w") as f:
+                f.write(text)
+        else:
+            sys.stdout.write(text)
+        return
+    def to_array(value):
+        value = np.asarray(value)
+        # Exact (object) results are saved as strings, loadable without pickle
+        return value.astype(str) if value.dtype == object else value
+
+    arrays = {}
+    for op, value in results.items():
+        if isinstance(value, dict):
+            arrays.update({f"{op}.{k}": to_array(v) for k, v in value.items()})
+        else:
+            arrays[op] = to_array(value)
+    target = output or sys.stdout.buffer
+    if len(arrays) == 1:
+        np.save(target, next(iter(arrays.values())))
+    else:
+        np.savez(target, **arrays)
+
+# --- 🧩 FACTORIZATION ---
+
+def _triangular_solve(t, b, lower, unit_diagonal=False):
+    """Forward/back substitution, one vectorized row update per step (NumPy fallback)."""
+    x = np.array(b, dtype=np.result_type(t, b, np.float64))
+    n = t.shape[0]
+    for i in (range(n) if lower else range(n - 1, -1, -1)):
+        done = slice(0, i) if lower else slice(i + 1, n)
+        x[i] -= t[i, done] @ x[done]
+        if not unit_diagonal:
+            x[i] /= t[i, i]
+    return x
+
+def _lu_factor_numpy(a):
+    """LU with partial pivoting in LAPACK's (lu, piv) layout: row k was swapped with piv[k]."""
+    lu = np.array(a, dtype=a.dtype if a.dtype.kind in "fc" else np.float64)
+    n = lu.shape[0]
+    piv = np.arange(n)
+    for k in range(n):
+        p = k + int(np.argmax(np.abs(lu[k:, k])))
+        piv[k] = p
+        if p != k:
+            lu[[k, p]] = lu[[p, k]]
+        if lu[k, k] != 0:
+            lu[k + 1:, k] /= lu[k, k]
+            lu[k + 1:, k + 1:] -= np.outer(lu[k + 1:, k], lu[k, k + 1:])
+    return lu, piv
+
+class Factorization:
+    """LU (or Cholesky for SPD matrices) of a square matrix, reused by det, inverse and solve."""
+
+    def __init__(self, matrix):
+        a = np.asarray(matrix)
+        if a.dtype.kind not in "fc":
+            a = a.astype(np.float64)
+        self.n = a.shape[0]
+        self.kind = "lu"
+        # Kept for the condition estimate: ‖A‖₁ is the largest column sum
+        self.norm1 = np.abs(a).sum(axis=0).max() if self.n else 0.0
+        if self._looks_spd(a):
+            try:
+                if scipy_linalg is not None:
+                    self.factors = scipy_linalg.cho_factor(a, lower=True, check_finite=False)
+                else:
+                    self.factors = (np.linalg.cholesky(a), True)
+                self.kind = "cholesky"
+            except np.linalg.LinAlgError:
+                pass
+        if self.kind == "lu":
+            if scipy_linalg is not None:
+                # Singularity is reported by solve(); det() is simply 0
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", scipy_linalg.LinAlgWarning)
+                    self.factors = scipy_linalg.lu_factor(a, check_finite=False)
+            else:
+                self.factors = _lu_factor_numpy(a)
+        self.diagonal = np.diagonal(self.factors[0]).copy()
+
+    @staticmethod
+    def _looks_spd(a):
+        # Cheap necessary conditions; the Cholesky attempt decides the rest
+        d = np.diagonal(a)
+        return a.shape[0] > 0 and np.all(d.real > 0) and np.array_equal(a, a.conj().T)
+
+    @property
+    def singular(self):
+        return self.kind == "lu" and not np.all(self.diagonal)
+
+    def log_determinant(self):
+        """(sign, log|det|) like np.linalg.slogdet, so large matrices do not overflow."""
+        if self.kind == "cholesky":
+            return 1.0, 2 * np.sum(np.log(self.diagonal.real))
+        if self.singular:
+            return 0.0, -np.inf
+        swaps = np.count_nonzero(self.factors[1] != np.arange(self.n))
+        magnitude = np.abs(self.diagonal)
+        return (-1) ** swaps * np.prod(self.diagonal / magnitude), np.sum(np.log(magnitude))
+
+    def determinant(self):
+        sign, logdet = self.log_determinant()
+        with np.errstate(over="ignore"):  # inf, as np.linalg.det would give
+            return sign * np.exp(logdet)
+
+    def solve(self, b):
+        """Solve Ax = b; b may be a vector or a matrix of right-hand sides (one per column)."""
+        if self.singular:
+            raise np.linalg.LinAlgError("Singular matrix")
+        b = np.asarray(b)
+        if scipy_linalg is not None:
+            if self.kind == "cholesky":
+                return scipy_linalg.cho_solve(self.factors, b, check_finite=False)
+            return scipy_linalg.lu_solve(self.factors, b, check_finite=False)
+        if self.kind == "cholesky":
+            low = self.factors[0]
+            y = _triangular_solve(low, b, lower=True)
+            return _triangular_solve(low.conj().T, y, lower=False)
+        lu, piv = self.factors
+        x = np.array(b, dtype=np.result_type(lu, b))
+        for k, p in enumerate(piv):
+            if p != k:
+                x[[k, p]] = x[[p, k]]
+        y = _triangular_solve(lu, x, lower=True, unit_diagonal=True)
+        return _triangular_solve(lu, y, lower=False)
+
+    def solve_adjoint(self, b):
+        """Solve Aᴴx = b with the same factors (Aᵀ for real matrices)."""
+        if self.singular:
+            raise np.linalg.LinAlgError("Singular matrix")
+        if self.kind == "cholesky":
+            return self.solve(b)  # Hermitian
+        b = np.asarray(b)
+        if scipy_linalg is not None:
+            return scipy_linalg.lu_solve(self.factors, b, trans=2, check_finite=False)
+        # A = P L U, so Aᴴ = Uᴴ Lᴴ Pᵀ: solve with Uᴴ, then Lᴴ, then undo the swaps
+        lu, piv = self.factors
+        y = _triangular_solve(lu.conj().T, b, lower=True)
+        x = _triangular_solve(lu.conj().T, y, lower=False, unit_diagonal=True)
+        for k in range(self.n - 1, -1, -1):
+            p = piv[k]
+            if p != k:
+                x[[k, p]] = x[[p, k]]
+        return x
+
+    def inverse_norm1_estimate(self, max_iter=5):
+        """Estimate ‖A⁻¹‖₁ with Hager's method as refined by Higham (LAPACK xLACON).
+
+        Each step costs one solve with A and one with Aᴴ, i.e. O(n²) against
+        the factorization, instead of the O(n³) of an SVD or explicit inverse.
+        """
+        if self.singular:
+            return np.inf
+        n = self.n
+        if n == 0:
+            return 0.0
+        x = np.full(n, 1.0 / n)
+        estimate, previous = 0.0, None
+        for i in range(max_iter):
+            y = self.solve(x)
+            estimate = np.abs(y).sum()
+            magnitude = np.abs(y)
+            signs = np.where(magnitude > 0, y / np.where(magnitude > 0, magnitude, 1), 1)
+            z = self.solve_adjoint(signs)
+            j = int(np.argmax(np.abs(z)))
+            if i > 0 and (j == previous or np.abs(z[j]) <= np.real(np.vdot(z, x))):
+                break
+            x = np.zeros(n, dtype=x.dtype)
+            x[j] = 1.0
+            previous = j
+        # Higham's extra test vector guards against Hager's known bad cases
+        alt = (-1.0) ** np.arange(n) * (1 + np.arange(n) / max(n - 1, 1))
+        return max(estimate, 2 * np.abs(self.solve(alt)).sum() / (3 * n))
+
+    def condition_estimate(self):
+        """κ₁(A) ≈ ‖A‖₁ · ‖A⁻¹‖₁, inf when singular."""
+        if self.singular:
+            return np.inf
+        return self.norm1 * self.inverse_norm1_estimate()
+
+    def inverse(self):
+        return self.solve(np.eye(self.n, dtype=self.factors[0].dtype))
+
 class MatrixSolver:
     def __init__(self):
-        self.matrix = None
+        self._matrix = None
+        self._factorization = None
+        self._low_factorization = None
+        self._exact_solver = None
+        self.exact = False
         self.rows = 0
         self.cols = 0
 
+    @property
+    def matrix(self):
+        return self._matrix
+
+    @matrix.setter
+    def matrix(self, matrix):
+        # Any new matrix invalidates the cached factorization
+        self._matrix = matrix
+        self._factorization = None
+        self._low_factorization = None
+        self._exact_solver = None
+        self.rows, self.cols = matrix.shape if matrix is not None else (0, 0)
+
+    def set_matrix(self, matrix):
+        matrix = np.asarray(matrix)
+        if matrix.ndim != 2:
+            raise ValueError(f"expected a 2-D matrix, got shape {matrix.shape}")
+        self.matrix = matrix
+
+    def exact_solver(self):
+        """ExactSolver for the current matrix, cached like the factorization."""
+        if self._exact_solver is None:
+            self._exact_solver = ExactSolver(self.matrix)
+        return self._exact_solver
+
+    def low_precision_factorization(self):
+        """float32 (complex64) factorization for mixed-precision solves, cached too."""
+        self._require_square()
+        if self._low_factorization is None:
+            low = np.complex64 if np.iscomplexobj(self.matrix) else np.float32
+            self._low_factorization = Factorization(np.asarray(self.matrix, dtype=low))
+        return self._low_factorization
+
+    def factorization(self):
+        """LU/Cholesky of the current matrix, computed on first use and cached."""
+        self._require_square()
+        if self._factorization is None:
+            self._factorization = Factorization(self.matrix)
+        return self._factorization
+
     def clean_screen(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        # ANSI clear + home instead of spawning a shell; nothing when piped
+        if sys.stdout.isatty():
+            print("\033[2J\033[H", end="", flush=True)
 
     def clean_number(self, n):
         """Standardizes floating point noise to cleaner numbers."""
+        if isinstance(n, complex):
+            n = complex(self.clean_number(n.real), self.clean_number(n.imag))
+            return n.real if n.imag == 0 else n
         if abs(n) < ZERO_THRESHOLD: return 0.0
         if abs(n - round(n)) < ZERO_THRESHOLD: return float(round(n))
         return n
 
+    def clean_array(self, a):
+        """clean_number over a whole array with NumPy masks."""
+        a = np.asarray(a)
+        if np.iscomplexobj(a):
+            cleaned = self.clean_array(a.real) + 1j * self.clean_array(a.imag)
+            return cleaned.real if not np.any(cleaned.imag) else cleaned
+        a = a.astype(np.float64)
+        a[np.abs(a) < ZERO_THRESHOLD] = 0.0
+        rounded = np.round(a)
+        with np.errstate(invalid="ignore"):  # inf - inf; inf/nan are left alone
+            near = np.abs(a - rounded) < ZERO_THRESHOLD
+        a[near] = rounded[near]
+        return a
+
+    def format_array(self, a):
+        """format_number over a cleaned array, producing a NumPy string array."""
+        if np.iscomplexobj(a):
+            return np.char.add(np.char.add(np.char.mod("%.2f+", a.real), np.char.mod("%.2f", a.imag)), "j")
+        whole = np.isfinite(a) & (a == np.round(a))
+        out = np.char.mod(f"%.{PRECISION_DISPLAY}f", a).astype(object)
+        # %d of an integral float is exact; `+ 0` turns -0.0 into 0.0
+        out[whole] = np.char.mod("%d", a[whole] + 0)
+        return out.astype(str)
+
     def format_number(self, n):
         n = self.clean_number(n)
         if isinstance(n, complex):
@@ -40,32 +461,52 @@ class MatrixSolver:
         if n.is_integer(): return f"{int(n)}"
         return f"{n:.{PRECISION_DISPLAY}f}"
 
-    def render_matrix(self, matrix_data, title="MATRIX"):
-        """Renders High-Fidelity Mathematical Matrix with Unicode."""
+    def render_matrix(self, matrix_data, title="MATRIX", max_rows=None, max_cols=None):
+        """Renders High-Fidelity Mathematical Matrix with Unicode.
+
+        Only the displayed part is cleaned and formatted, so the cost is bounded:
+        beyond max_rows/max_cols just the corners are shown.
+        """
         if matrix_data is None: return
+        max_rows = max_rows or RENDER_MAX_ROWS
+        max_cols = max_cols or RENDER_MAX_COLS
         
         # Handle 1D arrays (vectors) by converting to 2D
         if len(matrix_data.shape) == 1:
             matrix_data = matrix_data.reshape(-1, 1)
 
-        clean_mat = np.vectorize(self.clean_number)(matrix_data)
-        rows, cols = clean_mat.shape
-        str_grid = []
-        col_widths = [0] * cols
+        rows, cols = matrix_data.shape
+        cut_rows, cut_cols = rows > max_rows, cols > max_cols
+        e = RENDER_EDGE_ITEMS
+        shown = matrix_data
+        if cut_rows:
+            shown = np.concatenate([shown[:e], shown[-e:]])
+        if cut_cols:
+            shown = np.concatenate([shown[:, :e], shown[:, -e:]], axis=1)
 
-        for r in range(rows):
-            row_strs = []
-            for c in range(cols):
-                s = self.format_number(clean_mat[r, c])
-                row_strs.append(s)
-                if len(s) > col_widths[c]: col_widths[c] = len(s)
-            str_grid.append(row_strs)
+        if shown.dtype == object:
+            # Exact Fractions; only the shown part is formatted, so this stays cheap
+            grid = np.array([[str(v) for v in row] for row in shown])
+        else:
+            grid = self.format_array(self.clean_array(shown))
+        if cut_cols:
+            grid = np.concatenate([grid[:, :e], np.full((len(grid), 1), "⋯"), grid[:, e:]], axis=1)
+        if cut_rows:
+            gap = np.full((1, grid.shape[1]), "⋮")
+            if cut_cols:
+                gap[0, e] = "⋱"
+            grid = np.concatenate([grid[:e], gap, grid[e:]])
 
-        total_width = sum(col_widths) + (cols - 1) * 2
+        col_widths = np.char.str_len(grid).max(axis=0)
+        columns = [np.char.rjust(grid[:, c], int(w)) for c, w in enumerate(col_widths)]
+        lines = ["  ".join(parts) for parts in zip(*columns)]
+
+        total_width = int(col_widths.sum()) + (grid.shape[1] - 1) * 2
+        if cut_rows or cut_cols:
+            title = f"{title} ({rows}x{cols}, corners shown)"
         print(f"\n{Colors.CYAN}--- {title} ---{Colors.ENDC}")
         print(f"{Colors.BOLD}⎡{Colors.ENDC} " + " " * total_width + f" {Colors.BOLD}⎤{Colors.ENDC}")
-        for r in range(rows):
-            line = "  ".join(str_grid[r][c].rjust(col_widths[c]) for c in range(cols))
+        for line in lines:
             print(f"{Colors.BOLD}⎢{Colors.ENDC} {line} {Colors.BOLD}⎥{Colors.ENDC}")
         print(f"{Colors.BOLD}⎣{Colors.ENDC} " + " " * total_width + f" {Colors.BOLD}⎦{Colors.ENDC}\n")
 
@@ -86,39 +527,141 @@ class MatrixSolver:
                         data.append(row_vals)
                         break
                     except ValueError: print(f"{Colors.FAIL}Invalid input.{Colors.ENDC}")
-            self.matrix = np.array(data)
-            self.rows, self.cols = r, c
+            self.set_matrix(np.array(data))
             self.clean_screen()
             self.render_matrix(self.matrix, "USER MATRIX")
         except ValueError:
             self.get_input()
 
+    # --- 🔢 COMPUTATIONS (no I/O; shared by the menu and headless mode) ---
+
+    def _require_square(self):
+        if self.rows != self.cols:
+            raise ValueError(f"square matrix required, got {self.rows}x{self.cols}")
+
+    def determinant(self):
+        return self.factorization().determinant()
+
+    def inverse(self):
+        return self.factorization().inverse()
+
+    def rank(self):
+        return int(np.linalg.matrix_rank(self.matrix))
+
+    def condition_number(self):
+        """Estimated 1-norm condition number from the cached factorization."""
+        return self.factorization().condition_estimate()
+
+    def conditioning_warning(self, cond=None):
+        """A warning line when the matrix is nearly singular, else None.
+
+        cond defaults to condition_number(); pass an estimate already at hand
+        to avoid building the float64 factorization just for the warning.
+        """
+        if cond is None:
+            cond = self.condition_number()
+        if cond < COND_WARNING:
+            return None
+        if not np.isfinite(cond):
+            return "Matrix is numerically singular (κ₁ = ∞)"
+        digits = np.log10(cond)
+        return (f"Matrix is ill-conditioned: κ₁(A) ≈ {cond:.1e}, "
+                f"results may have lost ~{digits:.0f} of {-np.log10(np.finfo(np.float64).eps):.0f} digits")
+
+    def trace(self):
+        self._require_square()
+        return np.trace(self.matrix)
+
+    def eigen(self):
+        """Eigenvalues and eigenvectors (as columns)."""
+        self._require_square()
+        return np.linalg.eig(self.matrix)
+
+    def power(self, n):
+        self._require_square()
+        return np.linalg.matrix_power(self.matrix, n)
+
+    def solve(self, b):
+        """Solve Ax = b for a vector b, or for every column of a matrix B in one call."""
+        self._require_square()
+        b = np.asarray(b)
+        if b.shape[0] != self.rows:
+            raise ValueError(f"right-hand side has {b.shape[0]} rows, matrix has {self.rows}")
+        return self.factorization().solve(b)
+
+    def solve_mixed(self, b, max_iter=30):
+        """Solve Ax = b with a float32 factorization plus float64 iterative refinement.
+
+        Factoring in single precision is roughly twice as fast; each refinement
+        step costs one float64 residual and one float32 solve (both O(n²)) and
+        recovers float64 accuracy when κ(A)·eps32 is small. It stops on LAPACK
+        dsgesv's test ‖r‖∞ ≤ √n·eps·‖A‖∞·‖x‖∞; if that is not reached within
+        max_iter steps, or κ(A) is too large to start with, it falls back to the
+        float64 factorization. Returns (x, info) with 'iterations' and 'fallback'.
+        """
+        self._require_square()
+        b = np.asarray(b)
+        if b.shape[0] != self.rows:
+            raise ValueError(f"right-hand side has {b.shape[0]} rows, matrix has {self.rows}")
+        low = self.low_precision_factorization()
+        work = np.result_type(self.matrix, b, np.float64)
+        a = np.asarray(self.matrix, dtype=work)
+        if low.singular or low.condition_estimate() > MIXED_PRECISION_MAX_COND:
+            return self.solve(b), {"iterations": 0, "fallback": True}
+
+        def low_solve(r):
+            # Scale so the float32 cast neither overflows nor flushes to zero
+            scale = np.abs(r).max()
+            if scale == 0:
+                return np.zeros_like(r)
+            return low.solve((r / scale).astype(low.factors[0].dtype)).astype(work) * scale
+
+        x = low_solve(b.astype(work))
+        tolerance = np.sqrt(self.rows) * np.finfo(np.float64).eps * np.abs(a).sum(axis=1).max()
+        for i in range(max_iter + 1):
+            r = b - a @ x
+            if np.abs(r).max() <= tolerance * np.abs(x).max():
+                return x, {"iterations": i, "fallback": False}
+            if i < max_iter:
+                x += low_solve(r)
+        return self.solve(b), {"iterations": max_iter, "fallback": True}
+
     # --- 🧮 STANDARD OPERATIONS ---
     
     def op_determinant(self):
         if self.rows != self.cols: return print(f"{Colors.FAIL}Square Matrix required.{Colors.ENDC}")
-        print(f"\n|A| = {self.clean_number(np.linalg.det(self.matrix))}")
+        if self.exact:
+            return print(f"\n|A| = {self.exact_solver().determinant()}")
+        print(f"\n|A| = {self.clean_number(self.determinant())}")
 
     def op_inverse(self):
         if self.rows != self.cols: return print(f"{Colors.FAIL}Square Matrix required.{Colors.ENDC}")
         try:
-            self.render_matrix(np.linalg.inv(self.matrix), "INVERSE (A⁻¹)")
+            inverse = self.exact_solver().inverse() if self.exact else self.inverse()
+            self.render_matrix(inverse, "INVERSE (A⁻¹)")
+            self.warn_conditioning()
         except np.linalg.LinAlgError:
             print(f"{Colors.FAIL}Matrix is Singular (No Inverse).{Colors.ENDC}")
 
+    def warn_conditioning(self):
+        # Exact results are not affected by conditioning
+        message = None if self.exact else self.conditioning_warning()
+        if message:
+            print(f"{Colors.YELLOW}⚠ {message}{Colors.ENDC}")
+
     def op_transpose(self):
         self.render_matrix(self.matrix.T, "TRANSPOSE (Aᵀ)")
 
     def op_rank(self):
-        print(f"\nRank: {np.linalg.matrix_rank(self.matrix)}")
+        print(f"\nRank: {self.exact_solver().rank() if self.exact else self.rank()}")
 
     def op_trace(self):
         if self.rows != self.cols: return print(f"{Colors.FAIL}Square Matrix required.{Colors.ENDC}")
-        print(f"\nTrace (Sum of diagonal) = {self.clean_number(np.trace(self.matrix))}")
+        print(f"\nTrace (Sum of diagonal) = {self.clean_number(self.trace())}")
 
     def op_eigen(self):
         if self.rows != self.cols: return print(f"{Colors.FAIL}Square Matrix required.{Colors.ENDC}")
-        vals, vecs = np.linalg.eig(self.matrix)
+        vals, vecs = self.eigen()
         print(f"\n{Colors.GREEN}Eigenvalues found:{Colors.ENDC}")
         for v in vals:
             print(f" λ = {self.format_number(v)}")
@@ -128,23 +671,26 @@ class MatrixSolver:
         if self.rows != self.cols: return print(f"{Colors.FAIL}Square Matrix required.{Colors.ENDC}")
         try:
             p = int(input("Enter Integer Power (n): "))
-            self.render_matrix(np.linalg.matrix_power(self.matrix, p), f"MATRIX POWER (A^{p})")
+            self.render_matrix(self.power(p), f"MATRIX POWER (A^{p})")
         except ValueError: print("Invalid integer.")
 
     def op_solve_linear(self):
         """Solves Ax = B"""
         if self.rows != self.cols: return print(f"{Colors.FAIL}Coefficient matrix A must be square.{Colors.ENDC}")
-        print(f"\n{Colors.BLUE}Enter Vector B (Size {self.rows}){Colors.ENDC}")
+        print(f"\n{Colors.BLUE}Enter Vector B (Size {self.rows}), or several separated by ';'{Colors.ENDC}")
         try:
             b_raw = input(f"Enter {self.rows} numbers separated by space: ")
-            b = [float(x) for x in b_raw.split()]
-            if len(b) != self.rows: 
+            vectors = [[float(x) for x in part.split()] for part in b_raw.split(";")]
+            if any(len(v) != self.rows for v in vectors): 
                 print(f"{Colors.FAIL}Vector size mismatch.{Colors.ENDC}")
                 return
             
-            x = np.linalg.solve(self.matrix, b)
-            self.render_matrix(np.array(b), "VECTOR B")
-            self.render_matrix(x, "SOLUTION VECTOR X")
+            # Several vectors become the columns of B and are solved in one call
+            b = np.array(vectors[0]) if len(vectors) == 1 else np.array(vectors).T
+            x = self.exact_solver().solve(b) if self.exact else self.solve(b)
+            self.render_matrix(b, "VECTOR B" if b.ndim == 1 else "MATRIX B")
+            self.render_matrix(x, "SOLUTION VECTOR X" if x.ndim == 1 else "SOLUTION MATRIX X")
+            self.warn_conditioning()
         except np.linalg.LinAlgError:
             print(f"{Colors.FAIL}Matrix is Singular. No unique solution.{Colors.ENDC}")
         except ValueError:
@@ -271,6 +817,7 @@ class MatrixSolver:
             print("8. Solve System (Ax = B)")
             print("-" * 20)
             print(f"{Colors.YELLOW}9. 🎓 Step-by-Step Tutorials{Colors.ENDC}")
+            print(f"X. Exact Mode (fractions): {'ON' if self.exact else 'OFF'}")
             print(f"R. Input New Matrix")
             print(f"0. Exit")
             
@@ -285,6 +832,9 @@ class MatrixSolver:
             elif choice == '7': self.op_power()
             elif choice == '8': self.op_solve_linear()
             elif choice == '9': self.run_tutorial_menu()
+            elif choice == 'X':
+                self.exact = not self.exact
+                print(f"Exact mode {'ON: det, inverse, rank and solve give fractions' if self.exact else 'OFF'}")
             elif choice == 'R': self.get_input()
             elif choice == '0': sys.exit()
             else: print("Invalid Option")
@@ -293,10 +843,792 @@ class MatrixSolver:
                 input(f"\n{Colors.BLUE}[Press Enter to Continue]{Colors.ENDC}")
                 self.clean_screen()
 
-if __name__ == "__main__":
+    # --- 🤖 HEADLESS MODE ---
+
+    def run_operations(self, ops, rhs=None, power=None, mixed_precision=False):
+        """Run the named operations on the current matrix and return {op: result}.
+
+        Warnings about ill-conditioned matrices go to stderr for solve and inv.
+        """
+        if {"solve", "inv"} & set(ops) and self.rows == self.cols:
+            cond = None
+            # A mixed-precision solve only factors in float32; estimate from that
+            # unless another op needs the float64 factorization anyway, or the
+            # solve will fall back to it (where the float32 estimate is unreliable)
+            if mixed_precision and not {"det", "inv", "cond"} & set(ops):
+                cond = self.low_precision_factorization().condition_estimate()
+                if not cond <= MIXED_PRECISION_MAX_COND:
+                    cond = None
+            message = self.conditioning_warning(cond)
+            if message:
+                print(f"Warning: {message}", file=sys.stderr)
+        results = {}
+        for op in ops:
+            if op == "det":
+                results[op] = self.determinant()
+            elif op == "inv":
+                results[op] = self.inverse()
+            elif op == "rank":
+                results[op] = self.rank()
+            elif op == "trace":
+                results[op] = self.trace()
+            elif op == "transpose":
+                results[op] = self.matrix.T
+            elif op == "eig":
+                vals, vecs = self.eigen()
+                results[op] = {"values": vals, "vectors": vecs}
+            elif op == "cond":
+                results[op] = self.condition_number()
+            elif op == "solve":
+                if rhs is None:
+                    raise ValueError("'solve' needs --rhs")
+                if mixed_precision:
+                    x, info = self.solve_mixed(rhs)
+                    results[op] = {"x": x, **info}
+                else:
+                    results[op] = self.solve(rhs)
+            elif op == "power":
+                if power is None:
+                    raise ValueError("'power' needs --power N")
+                results[op] = self.power(power)
+            else:
+                raise ValueError(f"unknown operation '{op}'")
+        return results
+
+class SparseSolver:
+    """CSR matrix with Krylov solvers and Lanczos/Arnoldi eigenpairs (requires SciPy).
+
+    Nothing here densifies the matrix, so memory stays O(nnz).
+    """
+
+    METHODS = ("auto", "cg", "gmres", "bicgstab")
+    PRECONDITIONERS = ("none", "jacobi", "ilu")
+
+    def __init__(self, matrix):
+        if sparse is None:
+            raise ImportError("sparse mode needs scipy: pip install scipy")
+        self.matrix = sparse.csr_matrix(matrix)
+        self.rows, self.cols = self.matrix.shape
+        self._symmetric = None
+
+    def _require_square(self):
+        if self.rows != self.cols:
+            raise ValueError(f"square matrix required, got {self.rows}x{self.cols}")
+
+    @property
+    def symmetric(self):
+        if self._symmetric is None:
+            diff = abs(self.matrix - self.matrix.T)
+            scale = abs(self.matrix).max() if self.matrix.nnz else 0.0
+            self._symmetric = diff.nnz == 0 or diff.max() <= ZERO_THRESHOLD * scale
+        return self._symmetric
+
+    def trace(self):
+        self._require_square()
+        return self.matrix.diagonal().sum()
+
+    def preconditioner(self, kind):
+        """LinearOperator approximating A⁻¹, or None."""
+        if kind == "none":
+            return None
+        if kind == "jacobi":
+            d = self.matrix.diagonal()
+            if not np.all(d):
+                raise ValueError("Jacobi preconditioner needs a nonzero diagonal")
+            inv_d = 1.0 / d
+            return sparse_linalg.LinearOperator(self.matrix.shape, matvec=lambda x: inv_d * x.ravel(),
+                                                dtype=np.result_type(inv_d, np.float64))
+        if kind == "ilu":
+            # Looser than SciPy's defaults: the fill (and cost per apply) stays near 10x nnz
+            ilu = sparse_linalg.spilu(self.matrix.tocsc(), drop_tol=1e-3, fill_factor=5)
+            return sparse_linalg.LinearOperator(self.matrix.shape, matvec=ilu.solve, dtype=ilu.L.dtype)
+        raise ValueError(f"unknown preconditioner '{kind}'")
+
+    def solve(self, b, method="auto", precond="none", tol=1e-8, maxiter=None, restart=50):
+        """Iteratively solve Ax = b; returns x with convergence details.
+
+        'auto' picks CG for symmetric matrices and BiCGSTAB otherwise (or with
+        ILU, which is not symmetric). CG assumes the matrix is also positive definite.
+        """
+        self._require_square()
+        b = np.asarray(b)
+        if b.shape != (self.rows,):
+            raise ValueError(f"right-hand side must be a vector of length {self.rows}")
+        if method == "auto":
+            method = "cg" if self.symmetric and precond != "ilu" else "bicgstab"
+        if method == "cg" and not self.symmetric:
+            raise ValueError("cg needs a symmetric positive definite matrix; use gmres or bicgstab")
+        if method == "cg" and precond == "ilu":
+            raise ValueError("cg needs a symmetric preconditioner; use jacobi, or ilu with gmres/bicgstab")
+        iterations = 0
+        def count(_):
+            nonlocal iterations
+            iterations += 1
+        M = self.preconditioner(precond)
+        if method == "cg":
+            x, info = sparse_linalg.cg(self.matrix, b, rtol=tol, maxiter=maxiter, M=M, callback=count)
+        elif method == "bicgstab":
+            x, info = sparse_linalg.bicgstab(self.matrix, b, rtol=tol, maxiter=maxiter, M=M, callback=count)
+        elif method == "gmres":
+            x, info = sparse_linalg.gmres(self.matrix, b, rtol=tol, maxiter=maxiter, M=M, restart=restart,
+                                          callback=count, callback_type="pr_norm")
+        else:
+            raise ValueError(f"unknown method '{method}'")
+        if info < 0:
+            raise np.linalg.LinAlgError(f"{method} broke down (info={info})")
+        norm_b = np.linalg.norm(b)
+        residual = np.linalg.norm(b - self.matrix @ x) / (norm_b if norm_b else 1.0)
+        return {"x": x, "method": method, "converged": info == 0,
+                "iterations": iterations, "residual": residual}
+
+    def eigen(self, k=6, which="LM", tol=0.0, maxiter=None):
+        """k extreme eigenpairs: Lanczos (eigsh) when symmetric, Arnoldi (eigs) otherwise.
+
+        which follows SciPy: LM/SM by magnitude, LA/SA (symmetric) or LR/SR by value.
+        """
+        self._require_square()
+        limit = self.rows if self.symmetric else self.rows - 1
+        if not 0 < k < limit:
+            raise ValueError(f"k must be between 1 and {limit - 1} for this {self.rows}x{self.rows} matrix")
+        if self.symmetric:
+            which = {"LR": "LA", "SR": "SA"}.get(which, which)
+            vals, vecs = sparse_linalg.eigsh(self.matrix, k=k, which=which, tol=tol, maxiter=maxiter)
+        else:
+            which = {"LA": "LR", "SA": "SR"}.get(which, which)
+            vals, vecs = sparse_linalg.eigs(self.matrix, k=k, which=which, tol=tol, maxiter=maxiter)
+        # Most extreme first
+        key = {"LM": -np.abs(vals), "SM": np.abs(vals), "SA": vals.real, "SR": vals.real}.get(which, -vals.real)
+        order = np.argsort(key, kind="stable")
+        return vals[order], vecs[:, order]
+
+    def run_operations(self, ops, rhs=None, method="auto", precond="none", tol=1e-8,
+                       maxiter=None, k=6, which="LM"):
+        """Headless counterpart of MatrixSolver.run_operations for SPARSE_OPERATIONS."""
+        results = {}
+        for op in ops:
+            if op == "trace":
+                results[op] = self.trace()
+            elif op == "solve":
+                if rhs is None:
+                    raise ValueError("'solve' needs --rhs")
+                results[op] = self.solve(rhs, method, precond, tol, maxiter)
+            elif op == "eig":
+                vals, vecs = self.eigen(k, which)
+                results[op] = {"values": vals, "vectors": vecs}
+            else:
+                raise ValueError(f"'{op}' is not available in sparse mode "
+                                 f"(use {', '.join(SPARSE_OPERATIONS)})")
+        return results
+
+# Input bytes per chunk in batch mode; bounds LAPACK copies and temporaries
+BATCH_CHUNK_BYTES = 32 * 2**20
+
+class BatchSolver:
+    """The same operation over an (N, n, n) stack of matrices, chunk by chunk.
+
+    Each chunk is one broadcasting np.linalg call. Singular items do not abort
+    the batch: their results are NaN and their indices are reported.
+    """
+
+    def __init__(self, stack, chunk_size=None):
+        if stack.ndim != 3 or stack.shape[1] != stack.shape[2]:
+            raise ValueError(f"batch mode needs an (N, n, n) stack, got shape {stack.shape}")
+        self.stack = stack
+        self.count, self.n = stack.shape[0], stack.shape[1]
+        itemsize = max(stack.dtype.itemsize, 8)
+        self.chunk_size = chunk_size or max(1, BATCH_CHUNK_BYTES // (self.n * self.n * itemsize))
+
+    def _chunks(self, *others):
+        """Yield (start, chunk, *matching slices of others); memmaps are read one chunk at a time."""
+        for start in range(0, self.count, self.chunk_size):
+            stop = min(start + self.chunk_size, self.count)
+            a = np.asarray(self.stack[start:stop])
+            if a.dtype.kind not in "fc":
+                a = a.astype(np.float64)
+            yield (start, a) + tuple(np.asarray(o[start:stop]) for o in others)
+
+    @staticmethod
+    def _guarded(func, a, *args):
+        """func over a chunk; on LinAlgError, rerun without the items LU finds singular."""
+        try:
+            return func(a, *args), np.zeros(len(a), dtype=bool)
+        except np.linalg.LinAlgError:
+            pass
+        # slogdet runs the same LU as inv/solve: sign 0 means an exactly zero pivot
+        singular = np.linalg.slogdet(a)[0] == 0
+        ok = ~singular
+        result = func(a[ok], *(x[ok] for x in args))
+        full = np.full((len(a),) + result.shape[1:], np.nan, dtype=result.dtype)
+        full[ok] = result
+        return full, singular
+
+    def determinant(self):
+        return np.concatenate([np.linalg.det(a) for _, a in self._chunks()])
+
+    def trace(self):
+        return np.concatenate([np.trace(a, axis1=1, axis2=2) for _, a in self._chunks()])
+
+    def inverse(self):
+        """(inverses, singular indices); singular items are NaN."""
+        return self._run_guarded(np.linalg.inv)
+
+    def solve(self, b):
+        """Solve A[i] x[i] = b[i]; b is (N, n) vectors or (N, n, k) matrices."""
+        b = np.asarray(b)
+        if b.ndim not in (2, 3) or b.shape[0] != self.count or b.shape[1] != self.n:
+            raise ValueError(f"right-hand sides must be ({self.count}, {self.n}) or "
+                             f"({self.count}, {self.n}, k), got {b.shape}")
+        if b.ndim == 2:
+            # NumPy treats a 2-D b as a matrix, so vectors get a trailing axis
+            x, singular = self._run_guarded(lambda a, v: np.linalg.solve(a, v[..., None])[..., 0], b)
+        else:
+            x, singular = self._run_guarded(np.linalg.solve, b)
+        return x, singular
+
+    def _run_guarded(self, func, *others):
+        parts, flags = [], []
+        for start, a, *rest in self._chunks(*others):
+            result, singular = self._guarded(func, a, *rest)
+            parts.append(result)
+            flags.append(singular)
+        return np.concatenate(parts), np.flatnonzero(np.concatenate(flags))
+
+    def eigen(self):
+        """Eigenvalues (N, n) and eigenvectors (N, n, n); complex if any chunk needs it."""
+        values, vectors = [], []
+        for _, a in self._chunks():
+            w, v = np.linalg.eig(a)
+            values.append(w)
+            vectors.append(v)
+        return np.concatenate(values), np.concatenate(vectors)
+
+    def run_operations(self, ops, rhs=None):
+        """Headless counterpart of MatrixSolver.run_operations for BATCH_OPERATIONS."""
+        results = {}
+        for op in ops:
+            if op == "det":
+                results[op] = self.determinant()
+            elif op == "trace":
+                results[op] = self.trace()
+            elif op == "inv":
+                inv, singular = self.inverse()
+                results[op] = {"values": inv, "singular": singular}
+            elif op == "solve":
+                if rhs is None:
+                    raise ValueError("'solve' needs --rhs")
+                x, singular = self.solve(rhs)
+                results[op] = {"values": x, "singular": singular}
+            elif op == "eig":
+                vals, vecs = self.eigen()
+                results[op] = {"values": vals, "vectors": vecs}
+            else:
+                raise ValueError(f"'{op}' is not available in batch mode "
+                                 f"(use {', '.join(BATCH_OPERATIONS)})")
+        return results
+
+class OutOfCoreEngine:
+    """Tiled matrix multiply and power over .npy memmaps, for matrices larger than RAM.
+
+    Every output tile is accumulated in memory from a row panel of A and a
+    column panel of B, then written once; tiles are spread over a thread
+    pool (NumPy's matmul releases the GIL). Resident memory is about
+    3 * tile**2 elements per thread, independent of the matrix size.
+    """
+
+    def __init__(self, tile=None, threads=None, scratch_dir=None):
+        self.tile = tile or OOC_TILE
+        self.threads = threads or os.cpu_count() or 1
+        self.scratch_dir = scratch_dir
+
+    def _tiles(self, size):
+        return [(i, min(i + self.tile, size)) for i in range(0, size, self.tile)]
+
+    def matmul(self, a, b, out_path):
+        """Write A @ B to the .npy file out_path and return it memory-mapped."""
+        if a.ndim != 2 or b.ndim != 2 or a.shape[1] != b.shape[0]:
+            raise ValueError(f"cannot multiply {a.shape} by {b.shape}")
+        m, k, n = a.shape[0], a.shape[1], b.shape[1]
+        out = np.lib.format.open_memmap(out_path, mode="w+",
+                                        dtype=np.result_type(a.dtype, b.dtype), shape=(m, n))
+        inner = self._tiles(k)
+
+        def product_tile(rows, cols):
+            (r0, r1), (c0, c1) = rows, cols
+            acc = np.zeros((r1 - r0, c1 - c0), dtype=out.dtype)
+            for p0, p1 in inner:
+                acc += np.asarray(a[r0:r1, p0:p1]) @ np.asarray(b[p0:p1, c0:c1])
+            out[r0:r1, c0:c1] = acc
+
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            # list() re-raises the first worker error, if any
+            list(pool.map(lambda rc: product_tile(*rc),
+                          [(rows, cols) for rows in self._tiles(m) for cols in self._tiles(n)]))
+        out.flush()
+        return out
+
+    def _write(self, source, out_path):
+        """Copy source into out_path, a row panel at a time."""
+        out = np.lib.format.open_memmap(out_path, mode="w+", dtype=source.dtype, shape=source.shape)
+        for r0, r1 in self._tiles(source.shape[0]):
+            out[r0:r1] = source[r0:r1]
+        out.flush()
+        return out
+
+    def power(self, a, n, out_path):
+        """Write A**n to out_path by repeated squaring; intermediates live in scratch_dir.
+
+        Needs about log2(n) + popcount(n) - 1 multiplies and scratch space for
+        two matrices besides the output.
+        """
+        if a.ndim != 2 or a.shape[0] != a.shape[1]:
+            raise ValueError(f"square matrix required, got shape {a.shape}")
+        if n < 0:
+            raise ValueError("out-of-core power needs n >= 0")
+        if n == 0:
+            out = np.lib.format.open_memmap(out_path, mode="w+", dtype=a.dtype, shape=a.shape)
+            for r0, r1 in self._tiles(a.shape[0]):
+                out[r0:r1] = 0
+                out[r0:r1, r0:r1] = np.eye(r1 - r0, dtype=a.dtype)
+            out.flush()
+            return out
+        with tempfile.TemporaryDirectory(prefix="matrix-ooc-", dir=self.scratch_dir,
+                                         ignore_cleanup_errors=True) as scratch:
+            bits = bin(n)[:1:-1]  # least significant first; the last bit is always 1
+            base, result = a, None
+            for i, bit in enumerate(bits):
+                last = i == len(bits) - 1
+                if bit == "1":
+                    if result is None:
+                        result = base
+                    else:
+                        target = out_path if last else os.path.join(scratch, f"result-{i}.npy")
+                        result = self.matmul(result, base, target)
+                if not last:
+                    base = self.matmul(base, base, os.path.join(scratch, f"square-{i + 1}.npy"))
+                    self._drop_stale(scratch, keep=(base, result))
+            if getattr(result, "filename", None) != os.path.abspath(out_path):
+                # n was a power of two (or 1): the answer is a scratch file or A itself
+                result = self._write(result, out_path)
+        return result
+
+    @staticmethod
+    def _drop_stale(scratch, keep):
+        """Delete scratch matrices no longer referenced, so disk use stays at ~2 matrices."""
+        live = {os.path.abspath(getattr(x, "filename", "") or "") for x in keep}
+        for name in os.listdir(scratch):
+            path = os.path.join(scratch, name)
+            if path not in live:
+                os.remove(path)
+
+# --- 🎯 EXACT ARITHMETIC ---
+
+def _is_prime_32(n):
+    """Deterministic Miller-Rabin for n < 2**32 (bases 2, 7, 61)."""
+    if n < 2 or n % 2 == 0:
+        return n == 2
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for a in (2, 7, 61):
+        if a % n == 0:
+            continue
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+_MODULI = []
+
+def _moduli(start, count):
+    """Primes below 2**31 (largest first): residue products stay below 2**62 in int64."""
+    candidate = _MODULI[-1] - 2 if _MODULI else 2**31 - 1
+    while len(_MODULI) < start + count:
+        if _is_prime_32(candidate):
+            _MODULI.append(candidate)
+        candidate -= 2
+    return np.array(_MODULI[start:start + count], dtype=np.int64)
+
+def _moduli_for_bits(bits, start=0):
+    """Enough primes (from index start) that their product exceeds 2**bits."""
+    return _moduli(start, max(1, math.ceil((bits + 1) / 30.9)))
+
+def _log2_norm(vectors):
+    """log2 of the Euclidean norm of each row of an integer object array."""
+    return np.array([0.5 * math.log2(sum(v * v for v in row)) if any(row) else -math.inf
+                     for row in vectors])
+
+def _residues(a, primes):
+    """a (object ints) mod each prime, as a (P, ...) int64 array."""
+    if all(abs(int(v)) < 2**62 for v in a.flat):
+        return np.asarray(a, dtype=np.int64)[None] % primes.reshape((-1,) + (1,) * a.ndim)
+    return np.stack([(a % int(p)).astype(np.int64) for p in primes])
+
+def _crt(residues, primes):
+    """Garner's CRT over axis 0, returning the symmetric (signed) representatives."""
+    x = residues[0].astype(object)
+    m = int(primes[0])
+    for r, p in zip(residues[1:], primes[1:]):
+        p = int(p)
+        t = (r - (x % p).astype(np.int64)) % p * pow(m % p, -1, p) % p
+        x = x + m * t.astype(object)
+        m *= p
+    return np.where(x > m // 2, x - m, x)
+
+def _eliminate_mod(a, primes, b=None):
+    """Gaussian elimination of a (P, n, n) mod each prime, all primes at once.
+
+    Returns det residues (P,); with b (P, n, k) it runs Gauss-Jordan on [A | B]
+    and also returns X = A⁻¹B mod p (meaningless where det ≡ 0).
+    """
+    P, n = a.shape[0], a.shape[1]
+    m = a if b is None else np.concatenate([a, b], axis=2)
+    p = primes[:, None]
+    idx = np.arange(P)
+    det = np.ones(P, dtype=np.int64)
+    for k in range(n):
+        nz = m[:, k:, k] != 0
+        det[~nz.any(axis=1)] = 0
+        piv = k + nz.argmax(axis=1)
+        swapped = piv != k
+        det[swapped] = (-det[swapped]) % primes[swapped]
+        row = m[idx, piv].copy()
+        m[idx, piv] = m[idx, k]
+        pivot = row[:, k]
+        det = det * pivot % primes
+        inv = np.array([pow(int(v), -1, int(q)) if v else 0 for v, q in zip(pivot, primes)], dtype=np.int64)
+        row[:, k:] = row[:, k:] * inv[:, None] % p
+        m[idx, k] = row
+        # Columns left of k are already cleared, so only k: is updated
+        target = slice(None) if b is not None else slice(k + 1, None)
+        factors = m[:, target, k].copy()
+        if b is not None:
+            factors[:, k] = 0
+        m[:, target, k:] = (m[:, target, k:] - factors[:, :, None] * row[:, None, k:]) % p[:, :, None]
+    return (det, m[:, :, n:]) if b is not None else (det, None)
+
+def _bareiss(m, pivot_cols=None):
+    """Fraction-free elimination of an object int array in place.
+
+    Returns (rank, sign, pivot columns); every division is exact, so entries
+    stay integers no larger than minors of the input.
+    """
+    rows = m.shape[0]
+    pivot_cols = m.shape[1] if pivot_cols is None else pivot_cols
+    prev, sign, r, pivots = 1, 1, 0, []
+    for c in range(pivot_cols):
+        if r == rows:
+            break
+        nz = np.flatnonzero(m[r:, c] != 0)
+        if not len(nz):
+            continue
+        p = r + nz[0]
+        if p != r:
+            m[[r, p]] = m[[p, r]]
+            sign = -sign
+        pivot = m[r, c]
+        m[r + 1:, c + 1:] = (m[r + 1:, c + 1:] * pivot - np.outer(m[r + 1:, c], m[r, c + 1:])) // prev
+        m[r + 1:, c] = 0
+        prev = pivot
+        pivots.append(c)
+        r += 1
+    return r, sign, pivots
+
+def _to_fraction(x):
+    if isinstance(x, (int, np.integer)):
+        return Fraction(int(x))
+    if isinstance(x, Fraction):
+        return x
+    x = float(x)
+    if not math.isfinite(x):
+        raise ValueError(f"exact mode needs finite entries, got {x}")
+    # repr() gives the shortest decimal that round-trips, e.g. 0.1 -> 1/10
+    return Fraction(repr(x))
+
+def _normalize(values):
+    """Fractions with denominator 1 become ints."""
+    return np.array([v.numerator if v.denominator == 1 else v for v in values.flat],
+                    dtype=object).reshape(values.shape)
+
+class ExactSolver:
+    """Exact determinant, rank, inverse and solve over the rationals.
+
+    Entries become Fractions (floats via their shortest repr, so 0.1 is 1/10) and
+    each row is scaled to integers. Small matrices use fraction-free Bareiss
+    elimination on Python ints; from EXACT_MODULAR_MIN_SIZE on, 'auto' works
+    modulo many primes below 2**31 in vectorized int64 and rebuilds the result
+    with the CRT, using enough primes to cover the Hadamard bound.
+    """
+
+    METHODS = ("auto", "bareiss", "modular")
+
+    def __init__(self, matrix, method="auto"):
+        a = np.asarray(matrix)
+        if a.ndim != 2:
+            raise ValueError(f"expected a 2-D matrix, got shape {a.shape}")
+        if method not in self.METHODS:
+            raise ValueError(f"unknown exact method '{method}'")
+        fractions = np.array([_to_fraction(x) for x in a.flat], dtype=object).reshape(a.shape)
+        # Row scale factors: row i of self.ints is d_i times row i of A
+        self.scale = [math.lcm(*(f.denominator for f in row)) if len(row) else 1 for row in fractions]
+        self.ints = np.array([[int(f * d) for f in row] for row, d in zip(fractions, self.scale)],
+                             dtype=object).reshape(a.shape)
+        self.rows, self.cols = a.shape
+        self.method = method
+        if method == "auto":
+            self.method = "modular" if min(a.shape) >= EXACT_MODULAR_MIN_SIZE else "bareiss"
+
+    def _require_square(self):
+        if self.rows != self.cols:
+            raise ValueError(f"square matrix required, got {self.rows}x{self.cols}")
+
+    def _det_bits(self):
+        return float(np.sum(_log2_norm(self.ints)))
+
+    def _int_determinant(self):
+        """det of the row-scaled integer matrix."""
+        if self.method == "bareiss":
+            m = self.ints.copy()
+            rank, sign, _ = _bareiss(m)
+            return sign * m[-1, -1] if rank == self.rows else 0
+        bits = self._det_bits()
+        if bits == -math.inf:
+            return 0
+        primes = _moduli_for_bits(bits + 1)
+        det, _ = _eliminate_mod(_residues(self.ints, primes), primes)
+        return int(_crt(det[:, None], primes)[0])
+
+    def determinant(self):
+        self._require_square()
+        if self.rows == 0:
+            return 1
+        det = Fraction(self._int_determinant(), math.prod(self.scale))
+        return det.numerator if det.denominator == 1 else det
+
+    def rank(self):
+        if self.method == "bareiss":
+            return _bareiss(self.ints.copy())[0]
+        # Rank mod p never exceeds the rational rank and equals it unless p divides
+        # every maximal nonzero minor. No minor exceeds the product of the k largest
+        # row norms (Hadamard), so once the primes' product passes that bound some
+        # prime misses a nonzero rank-sized minor and the max is exact
+        k = min(self.rows, self.cols)
+        norms = np.sort(_log2_norm(self.ints))[::-1][:k]
+        bits = float(np.sum(norms[norms > -math.inf]))
+        best = 0
+        for p in _moduli_for_bits(bits):
+            m = _residues(self.ints, p.reshape(1))[0]
+            r = 0
+            for c in range(self.cols):
+                if r == self.rows:
+                    break
+                nz = np.flatnonzero(m[r:, c])
+                if not len(nz):
+                    continue
+                piv = r + nz[0]
+                m[[r, piv]] = m[[piv, r]]
+                m[r] = m[r] * pow(int(m[r, c]), -1, int(p)) % p
+                m[r + 1:] = (m[r + 1:] - m[r + 1:, c, None] * m[r]) % p
+                r += 1
+            best = max(best, r)
+            if best == k:
+                break
+        return best
+
+    def _solve_scaled(self, b):
+        """Solve (DA) X = b for an integer object matrix b; returns (det·X, det) as ints."""
+        n = self.rows
+        if self.method == "bareiss":
+            m = np.concatenate([self.ints, b], axis=1)
+            rank, sign, _ = _bareiss(m, pivot_cols=n)
+            if rank < n:
+                raise np.linalg.LinAlgError("Singular matrix")
+            # Fraction-free back substitution: y = det·x is integral (Cramer),
+            # so every division below is exact
+            det = m[n - 1, n - 1]
+            u, rhs = m[:, :n], m[:, n:]
+            y = np.empty(rhs.shape, dtype=object)
+            for i in range(n - 1, -1, -1):
+                y[i] = (det * rhs[i] - u[i, i + 1:] @ y[i + 1:]) // u[i, i]
+            return y * sign, det * sign
+        det_bits = self._det_bits()
+        if det_bits == -math.inf:
+            raise np.linalg.LinAlgError("Singular matrix")
+        # Cramer: each entry of det·X is a det with one column of A replaced by a
+        # column of b, so it is bounded by prod_j max(|a_j|, max|b_col|)
+        col_bits = _log2_norm(self.ints.T)
+        rhs_bits = max(_log2_norm(b.T)) if b.size else -math.inf
+        y_bits = float(np.sum(np.maximum(col_bits, rhs_bits)))
+        primes = _moduli_for_bits(max(det_bits, y_bits) + 1)
+        det_res, x_res = _eliminate_mod(_residues(self.ints, primes), primes, _residues(b, primes))
+        det = int(_crt(det_res[:, None], primes)[0])
+        if det == 0:
+            raise np.linalg.LinAlgError("Singular matrix")
+        y_res, used = [], []
+        good = det_res != 0
+        y_res.append(det_res[good, None, None] * x_res[good] % primes[good, None, None])
+        used.append(primes[good])
+        start = len(primes)
+        # Primes dividing det carry no X; replace them until the bound is covered
+        while sum(math.log2(q) for q in np.concatenate(used)) < y_bits + 1:
+            extra = _moduli(start, max(1, len(primes) - int(good.sum())))
+            start += len(extra)
+            d, x = _eliminate_mod(_residues(self.ints, extra), extra, _residues(b, extra))
+            ok = d != 0
+            y_res.append(d[ok, None, None] * x[ok] % extra[ok, None, None])
+            used.append(extra[ok])
+        return _crt(np.concatenate(y_res), np.concatenate(used)), det
+
+    def solve(self, b):
+        """Exact x with Ax = b; b is a vector or a matrix of right-hand sides."""
+        self._require_square()
+        b = np.asarray(b)
+        vector = b.ndim == 1
+        b = b.reshape(self.rows, -1)
+        fractions = np.array([_to_fraction(x) for x in b.flat], dtype=object).reshape(b.shape)
+        common = math.lcm(*(f.denominator for f in fractions.flat)) if fractions.size else 1
+        scaled = np.array([[int(f * common * d) for f in row] for row, d in zip(fractions, self.scale)],
+                          dtype=object).reshape(b.shape)
+        y, det = self._solve_scaled(scaled)
+        x = _normalize(np.vectorize(lambda v: Fraction(v, det * common), otypes=[object])(y))
+        return x[:, 0] if vector else x
+
+    def inverse(self):
+        """(DA)⁻¹ D = A⁻¹, so the right-hand side is the diagonal of row scales."""
+        self._require_square()
+        rhs = np.zeros((self.rows, self.rows), dtype=object)
+        for i, d in enumerate(self.scale):
+            rhs[i, i] = d
+        y, det = self._solve_scaled(rhs)
+        return _normalize(np.vectorize(lambda v: Fraction(v, det), otypes=[object])(y))
+
+    def run_operations(self, ops, rhs=None):
+        """Headless counterpart of MatrixSolver.run_operations for EXACT_OPERATIONS."""
+        results = {}
+        for op in ops:
+            if op == "det":
+                results[op] = self.determinant()
+            elif op == "rank":
+                results[op] = self.rank()
+            elif op == "inv":
+                results[op] = self.inverse()
+            elif op == "solve":
+                if rhs is None:
+                    raise ValueError("'solve' needs --rhs")
+                results[op] = self.solve(rhs)
+            else:
+                raise ValueError(f"'{op}' is not available in exact mode "
+                                 f"(use {', '.join(EXACT_OPERATIONS)})")
+        return results
+
+OPERATIONS = ("det", "inv", "rank", "trace", "transpose", "eig", "solve", "power", "cond")
+SPARSE_OPERATIONS = ("trace", "eig", "solve")
+BATCH_OPERATIONS = ("det", "trace", "inv", "eig", "solve")
+OUT_OF_CORE_OPERATIONS = ("power", "matmul")
+EXACT_OPERATIONS = ("det", "rank", "inv", "solve")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Matrix Solver Pro. Without arguments it starts the interactive menu.")
+    parser.add_argument("matrix", help="Matrix file: " + ", ".join(MATRIX_FORMATS))
+    parser.add_argument("--op", nargs="+", choices=OPERATIONS + ("matmul",), required=True, dest="ops",
+                        help="Operations to run, in order")
+    parser.add_argument("--key", help="Array name inside an .npz file")
+    parser.add_argument("--rhs", help="Right-hand side file for 'solve' (vector or matrix), B for 'matmul'")
+    parser.add_argument("--power", type=int, help="Exponent for 'power'")
+    parser.add_argument("--mixed-precision", action="store_true",
+                        help="'solve' factors in float32 and refines to float64 accuracy")
+    batch_group = parser.add_argument_group("batch mode")
+    batch_group.add_argument("--batch", action="store_true",
+                             help="MATRIX is an (N, n, n) stack (.npy is memory-mapped); ops: "
+                                  + ", ".join(BATCH_OPERATIONS))
+    batch_group.add_argument("--chunk-size", type=int,
+                             help=f"Matrices per vectorized call (default: ~{BATCH_CHUNK_BYTES >> 20} MiB)")
+    exact_group = parser.add_argument_group("exact mode")
+    exact_group.add_argument("--exact", action="store_true",
+                             help="Exact rational results (as 'p/q' strings); ops: " + ", ".join(EXACT_OPERATIONS))
+    exact_group.add_argument("--exact-method", choices=ExactSolver.METHODS, default="auto",
+                             help=f"bareiss, modular (CRT), or auto: modular from {EXACT_MODULAR_MIN_SIZE}x"
+                                  f"{EXACT_MODULAR_MIN_SIZE} on")
+    ooc_group = parser.add_argument_group("out-of-core mode")
+    ooc_group.add_argument("--out-of-core", action="store_true",
+                           help="Tiled power/matmul over .npy memmaps; the result goes to -o FILE.npy")
+    ooc_group.add_argument("--tile", type=int, help=f"Tile edge in elements (default {OOC_TILE})")
+    ooc_group.add_argument("--threads", type=int, help="Worker threads (default: CPU count)")
+    ooc_group.add_argument("--scratch", help="Directory for intermediate matrices (default: system temp)")
+    sparse_group = parser.add_argument_group("sparse mode (needs scipy)")
+    sparse_group.add_argument("--sparse", action="store_true",
+                              help="Keep the matrix in CSR form; ops: " + ", ".join(SPARSE_OPERATIONS))
+    sparse_group.add_argument("--method", choices=SparseSolver.METHODS, default="auto",
+                              help="Iterative solver (auto: cg if symmetric, else bicgstab)")
+    sparse_group.add_argument("--precond", choices=SparseSolver.PRECONDITIONERS, default="none",
+                              help="Preconditioner for the iterative solver")
+    sparse_group.add_argument("--tol", type=float, default=1e-8, help="Relative residual tolerance")
+    sparse_group.add_argument("--maxiter", type=int, help="Iteration limit")
+    sparse_group.add_argument("-k", type=int, default=6, help="Number of eigenpairs for 'eig'")
+    sparse_group.add_argument("--which", choices=("LM", "SM", "LA", "SA", "LR", "SR"), default="LM",
+                              help="Which eigenpairs: largest/smallest magnitude (LM/SM) or value")
+    parser.add_argument("--format", choices=("json", "npy"), default="json",
+                        help="json (default) or npy (.npz when there are several arrays)")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+    if args.batch + args.sparse + args.out_of_core + args.exact > 1:
+        parser.error("--batch, --sparse, --out-of-core and --exact cannot be combined")
+    if "matmul" in args.ops and not args.out_of_core:
+        parser.error("'matmul' is only available with --out-of-core")
+    if args.out_of_core:
+        if len(args.ops) != 1 or args.ops[0] not in OUT_OF_CORE_OPERATIONS:
+            parser.error("--out-of-core runs exactly one of: " + ", ".join(OUT_OF_CORE_OPERATIONS))
+        if not args.output or not args.output.lower().endswith(".npy"):
+            parser.error("--out-of-core writes its result to -o FILE.npy")
+
     try:
-        import numpy
-        app = MatrixSolver()
-        app.run()
-    except ImportError:
-        print("Please install numpy: pip install numpy")
\ No newline at end of file
+        if args.out_of_core:
+            engine = OutOfCoreEngine(args.tile, args.threads, args.scratch)
+            a = load_matrix(args.matrix, args.key)
+            if args.ops[0] == "power":
+                if args.power is None:
+                    raise ValueError("'power' needs --power N")
+                result = engine.power(a, args.power, args.output)
+            else:
+                if not args.rhs:
+                    raise ValueError("'matmul' needs --rhs B")
+                result = engine.matmul(a, load_matrix(args.rhs), args.output)
+            print(f"Saved: {args.output} ({result.shape[0]}x{result.shape[1]})")
+            return
+        rhs = None
+        if args.rhs:
+            rhs = load_matrix(args.rhs)
+            # A single row or column is a vector
+            if not args.batch and 1 in rhs.shape:
+                rhs = rhs.ravel()
+        if args.batch:
+            solver = BatchSolver(load_matrix(args.matrix, args.key), args.chunk_size)
+            results = solver.run_operations(args.ops, rhs)
+        elif args.exact:
+            solver = ExactSolver(load_matrix(args.matrix, args.key), args.exact_method)
+            results = solver.run_operations(args.ops, rhs)
+        elif args.sparse:
+            solver = SparseSolver(load_sparse_matrix(args.matrix))
+            results = solver.run_operations(args.ops, rhs, args.method, args.precond, args.tol,
+                                            args.maxiter, args.k, args.which)
+        else:
+            solver = MatrixSolver()
+            solver.set_matrix(load_matrix(args.matrix, args.key))
+            results = solver.run_operations(args.ops, rhs, args.power, args.mixed_precision)
+        write_results(results, args.format, args.output)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main()
+    else:
+        MatrixSolver().run()
\ No newline at end of file
@@ -2,28 +2,308 @@ import argparse
 import sys
 import random
 import json
+import mmap
+import os
+import struct
 import heapq
-from typing import List, Tuple, Optional
+import io
+import collections
+import multiprocessing
+import time
+import zipfile
+import itertools
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Tuple, Optional, Union
 
-def generate_maze(width: int, height: int) -> List[List[int]]:
-    """Generate perfect maze (1=wall, 0=path)."""
+# Cell values. BORDER only exists while carving (see _blank_grid).
+PATH, WALL, BORDER = 0, 1, 2
+
+class Maze:
+    """Compact maze grid: one byte per cell in a flat row-major bytearray.
+
+    Uses the same 1=wall / 0=path values as the nested-list form and supports
+    maze[y][x], maze[y][x] = v and len(), so code written for List[List[int]]
+    works on it unchanged at 1 byte per cell instead of ~8 bytes plus list
+    overhead.
+    """
+    __slots__ = ("width", "height", "cells")
+
+    def __init__(self, width: int, height: int, cells: Optional[bytearray] = None):
+        if cells is None:
+            cells = bytearray([WALL]) * (width * height)
+        if len(cells) != width * height:
+            raise ValueError(f"expected {width * height} cells, got {len(cells)}")
+        self.width = width
+        self.height = height
+        self.cells = cells
+
+    @classmethod
+    def from_rows(cls, rows: List[List[int]]) -> "Maze":
+        """Pack a nested-list maze."""
+        height, width = len(rows), len(rows[0])
+        cells = bytearray()
+        for row in rows:
+            if len(row) != width:
+                raise ValueError("maze rows must all have the same length")
+            cells.extend(row)
+        return cls(width, height, cells)
+
+    def to_rows(self) -> List[List[int]]:
+        """Unpack into the nested-list form."""
+        w = self.width
+        return [list(self.cells[y * w:(y + 1) * w]) for y in range(self.height)]
+
+    def row(self, y: int) -> memoryview:
+        """Zero-copy view of row y."""
+        return memoryview(self.cells)[y * self.width:(y + 1) * self.width]
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> memoryview:
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError("maze row out of range")
+        return self.row(y)
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield self.row(y)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Maze):
+            return (self.width, self.height, self.cells) == (other.width, other.height, other.cells)
+        return NotImplemented
+
+# Anything the maze functions accept: a Maze, a memory-mapped PackedMaze or
+# the nested-list form
+MazeLike = Union[Maze, "PackedMaze", List[List[int]]]
+
+def as_maze(maze: MazeLike) -> Maze:
+    """Return maze as a Maze, unpacking or packing other forms if needed."""
+    if isinstance(maze, Maze):
+        return maze
+    if isinstance(maze, PackedMaze):
+        return maze.unpack()
+    return Maze.from_rows(maze)
+
+# While carving, rooms and walls start as WALL, carved cells become PATH and
+# the outer border is BORDER. The carvers work on a grid with one extra BORDER
+# row above and below, so stepping two cells off any edge lands on BORDER and
+# needs no bounds check.
+def _blank_grid(width: int, height: int) -> bytearray:
+    """Flat row-major WALL grid framed by BORDER, plus one guard row each side."""
+    cells = bytearray([WALL]) * (width * (height + 2))
+    cells[:2 * width] = bytes([BORDER]) * (2 * width)
+    cells[-2 * width:] = bytes([BORDER]) * (2 * width)
+    cells[::width] = bytes([BORDER]) * (height + 2)
+    cells[width - 1::width] = bytes([BORDER]) * (height + 2)
+    return cells
+
+def _rooms(width: int, height: int) -> List[int]:
+    """Guarded-grid indices of all rooms (odd x, odd y)."""
+    return [(y + 1) * width + x for y in range(1, height - 1, 2) for x in range(1, width - 1, 2)]
+
+def _carve_backtracker(cells: bytearray, width: int, height: int, rng) -> None:
+    """Recursive backtracker (randomized DFS) with an explicit stack."""
+    # The first unvisited neighbour in a random order is a uniform pick
+    orders = list(itertools.permutations((-2, 2, -2 * width, 2 * width)))
+    rand = rng.random
+    start = 2 * width + 1
+    cells[start] = PATH
+    stack = [start]
+    push, pop = stack.append, stack.pop
+    while stack:
+        cur = stack[-1]
+        for d in orders[int(rand() * 24)]:
+            n = cur + d
+            if cells[n] == WALL:
+                cells[cur + d // 2] = PATH
+                cells[n] = PATH
+                push(n)
+                break
+        else:
+            pop()
+
+def _carve_prim(cells: bytearray, width: int, height: int, rng) -> None:
+    """Randomized Prim's: grow the maze from a random frontier wall each step."""
+    steps = (-2, 2, -2 * width, 2 * width)
+    rand = rng.random
+    start = 2 * width + 1
+    cells[start] = PATH
+    # Frontier entries are (wall, room beyond it)
+    frontier = [(start + d // 2, start + d) for d in steps if cells[start + d] == WALL]
+    while frontier:
+        i = int(rand() * len(frontier))
+        # Swap-remove keeps each pick O(1)
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        wall, room = frontier.pop()
+        if cells[room] != WALL:
+            continue
+        cells[wall] = PATH
+        cells[room] = PATH
+        for d in steps:
+            if cells[room + d] == WALL:
+                frontier.append((room + d // 2, room + d))
+
+def _carve_kruskal(cells: bytearray, width: int, height: int, rng) -> None:
+    """Randomized Kruskal's: knock down walls in random order with union-find."""
+    # Every wall cell that separates two rooms, as a guarded-grid index
+    walls = array("l")
+    for y in range(1, height - 1):
+        row = (y + 1) * width
+        if y % 2:
+            walls.extend(range(row + 2, row + width - 2, 2))  # between left/right rooms
+        else:
+            walls.extend(range(row + 1, row + width - 1, 2))  # between upper/lower rooms
+    rng.shuffle(walls)
+    parent = array("l", range(len(cells)))  # indexed by room cell index
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # path halving
+            x = parent[x]
+        return x
+
+    for w in walls:
+        if w // width % 2 == 0:  # guarded row even = real row odd
+            a, b = w - 1, w + 1
+        else:
+            a, b = w - width, w + width
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[ra] = rb
+            cells[a] = cells[b] = cells[w] = PATH
+
+def _carve_wilson(cells: bytearray, width: int, height: int, rng) -> None:
+    """Wilson's algorithm: loop-erased random walks, an unbiased spanning tree.
+
+    Slower than the others on big grids, as the first walks wander for long
+    before hitting the tree.
+    """
+    steps = (-2, 2, -2 * width, 2 * width)
+    rand = rng.random
+    rooms = _rooms(width, height)
+    rng.shuffle(rooms)
+    cells[rooms[0]] = PATH
+    last_step = {}
+    for start in rooms:
+        if cells[start] == PATH:
+            continue
+        # Random walk until the tree is hit; overwriting the step taken from a
+        # room erases any loop through it
+        cur = start
+        while cells[cur] != PATH:
+            d = steps[int(rand() * 4)]
+            if cells[cur + d] != BORDER:
+                last_step[cur] = d
+                cur += d
+        # Carve the loop-erased path into the tree
+        cur = start
+        while cells[cur] != PATH:
+            d = last_step[cur]
+            cells[cur] = cells[cur + d // 2] = PATH
+            cur += d
+        last_step.clear()
+
+def eller_rows(width: int, height: int, rng=None) -> Iterator[bytes]:
+    """Yield the rows of a perfect maze one at a time with Eller's algorithm.
+
+    Only the current row of set labels is kept, so memory is proportional to
+    the width however tall the maze is. width and height must be odd and at
+    least 3; each yielded row holds one 0/1 byte per cell.
+    """
+    rng = rng or random
+    rand = rng.random
+    cols = (width - 1) // 2  # rooms per row
+    rows = (height - 1) // 2
+    wall_row = bytes([WALL]) * width
+    yield wall_row
+    labels = [-1] * cols  # set label per room; -1 = not connected from above
+    for r in range(rows):
+        last = r == rows - 1
+        # Rooms not reached from above start in fresh singleton sets
+        next_label = max(labels) + 1
+        for c in range(cols):
+            if labels[c] < 0:
+                labels[c] = next_label
+                next_label += 1
+        parent = list(range(next_label))
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        room_row = bytearray(wall_row)
+        room_row[1::2] = bytes(cols)
+        # Randomly join neighbours in different sets; the last row joins all
+        for c in range(cols - 1):
+            a, b = find(labels[c]), find(labels[c + 1])
+            if a != b and (last or rand() < 0.5):
+                parent[b] = a
+                room_row[2 * c + 2] = PATH
+        labels = [find(label) for label in labels]
+        yield bytes(room_row)
+        if last:
+            break
+        # Every set needs at least one passage down, else it would be cut off
+        down = [rand() < 0.5 for _ in range(cols)]
+        members = {}
+        for c, label in enumerate(labels):
+            members.setdefault(label, []).append(c)
+        for group in members.values():
+            if not any(down[c] for c in group):
+                down[rng.choice(group)] = True
+        down_row = bytearray(wall_row)
+        # Relabel the sets carried down to 0..k-1 so labels stay small
+        relabel = {}
+        for c in range(cols):
+            if down[c]:
+                down_row[2 * c + 1] = PATH
+                labels[c] = relabel.setdefault(labels[c], len(relabel))
+            else:
+                labels[c] = -1
+        yield bytes(down_row)
+    yield wall_row
+
+def _carve_eller(cells: bytearray, width: int, height: int, rng) -> None:
+    """Eller's algorithm, row by row (see eller_rows for the streaming form)."""
+    for y, row in enumerate(eller_rows(width, height, rng)):
+        cells[(y + 1) * width:(y + 2) * width] = row
+
+ALGORITHMS = {
+    "backtracker": _carve_backtracker,
+    "prim": _carve_prim,
+    "kruskal": _carve_kruskal,
+    "wilson": _carve_wilson,
+    "eller": _carve_eller,
+}
+
+def _odd_size(width: int, height: int) -> Tuple[int, int]:
+    """Round a requested size up to odd dimensions and check it is usable."""
     if width % 2 == 0: width += 1
     if height % 2 == 0: height += 1
+    if width < 3 or height < 3:
+        raise ValueError("maze must be at least 3x3")
+    return width, height
+
+def generate_maze(width: int, height: int, algo: str = "backtracker",
+                  rng: Optional[random.Random] = None) -> Maze:
+    """Generate perfect maze (1=wall, 0=path) with one of ALGORITHMS."""
+    width, height = _odd_size(width, height)
+    if algo not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm '{algo}' (choose from {', '.join(ALGORITHMS)})")
     
-    maze = [[1 for _ in range(width)] for _ in range(height)]
+    cells = _blank_grid(width, height)
+    ALGORITHMS[algo](cells, width, height, rng or random)
+    # Drop the guard rows and turn the border into ordinary walls
+    cells = cells[width:-width].replace(bytes([BORDER]), bytes([WALL]))
     
-    def carve(cx: int, cy: int):
-        maze[cy][cx] = 0
-        dirs = [(0, -2), (2, 0), (0, 2), (-2, 0)]
-        random.shuffle(dirs)
-        
-        for dx, dy in dirs:
-            nx, ny = cx + dx, cy + dy
-            if 1 <= nx < width-1 and 1 <= ny < height-1 and maze[ny][nx] == 1:
-                maze[cy + dy//2][cx + dx//2] = 0
-                carve(nx, ny)
-    
-    carve(1, 1)
+    maze = Maze(width, height, cells)
     
     # Ensure start and exit are open
     maze[1][1] = 0  # Start
@@ -31,33 +311,130 @@ def generate_maze(width: int, height: int) -> List[List[int]]:
     
     return maze
 
-def render_maze(maze: List[List[int]], solution: Optional[List[Tuple[int,int]]] = None) -> List[str]:
-    """Clean Unicode rendering with PERFECT solution path."""
+# Render-only cell codes, layered on top of PATH/WALL
+ROUTE, START, EXIT = 2, 3, 4
+
+# Cell code -> glyph; rows are rendered with one str.translate call each
+_GLYPHS = {
+    PATH: "   ",   # Empty path
+    WALL: "███",   # Full block wall
+    ROUTE: "▓▓▓",  # DISTINCT solution path (not █)
+    START: " S ",
+    EXIT: " E ",
+}
+
+# Compact mode packs two rows into one line of half blocks, one character
+# per cell; (top, bottom) code pairs are combined as top * 5 + bottom.
+_HALF_BLOCKS = {
+    (PATH, PATH): " ", (WALL, WALL): "█", (WALL, PATH): "▀", (PATH, WALL): "▄",
+    (ROUTE, ROUTE): "▒", (ROUTE, PATH): "░", (PATH, ROUTE): "░",
+    (WALL, ROUTE): "▀", (ROUTE, WALL): "▄",
+}
+_HALF_BLOCK_TABLE = {}
+for _top in range(5):
+    for _bottom in range(5):
+        if START in (_top, _bottom):
+            _char = "S"
+        elif EXIT in (_top, _bottom):
+            _char = "E"
+        else:
+            _char = _HALF_BLOCKS[_top, _bottom]
+        _HALF_BLOCK_TABLE[_top * 5 + _bottom] = _char
+# Row bytes multiplied by 5, so the top row of a pair can be added to the bottom
+_TIMES_FIVE = bytes(min(255, 5 * v) for v in range(256))
+
+def _marked_rows(rows: Iterable, width: int, height: int,
+                 solution: Optional[List[Tuple[int,int]]] = None,
+                 start: Optional[Tuple[int,int]] = None,
+                 goal: Optional[Tuple[int,int]] = None) -> Iterator[bytes]:
+    """Yield rows as bytes of cell codes, with the route and S/E marked on open cells.
+
+    start and goal default to (1,1) and (w-2,h-2), as in solve_maze.
+    """
+    route = {}
+    for x, y in solution or ():
+        route.setdefault(y, []).append(x)
+    start = start or (1, 1)
+    goal = goal or (width - 2, height - 2)
+    # Start is applied last so it wins when both land on the same cell
+    marks = {}
+    marks.setdefault(goal[1], []).append((goal[0], EXIT))
+    marks.setdefault(start[1], []).append((start[0], START))
+    for y, row in enumerate(rows):
+        if y not in route and y not in marks:
+            yield bytes(row)
+            continue
+        row = bytearray(row)
+        for x in route.get(y, ()):
+            if row[x] == PATH:
+                row[x] = ROUTE
+        for x, code in marks.get(y, ()):
+            if 0 <= x < width and row[x] != WALL:
+                row[x] = code
+        yield bytes(row)
+
+def _half_block_lines(rows: Iterator[bytes], width: int) -> Iterator[str]:
+    """Pair up rows and yield one half-block line per pair."""
+    blank = bytes(width)
+    for top in rows:
+        bottom = next(rows, blank)
+        # Digits never exceed 24, so one big-integer addition adds every
+        # column at once without carries
+        combined = (int.from_bytes(top.translate(_TIMES_FIVE), "big")
+                    + int.from_bytes(bottom, "big")).to_bytes(width, "big")
+        yield combined.decode("latin-1").translate(_HALF_BLOCK_TABLE)
+
+def iter_render_rows(maze: MazeLike, solution: Optional[List[Tuple[int,int]]] = None,
+                     compact: bool = False) -> Iterator[str]:
+    """Yield rendered lines one at a time (two maze rows per line when compact)."""
     height, width = len(maze), len(maze[0])
-    path_set = set(solution) if solution else set()
-    
-    lines = []
-    for y in range(height):
-        line = ""
-        for x in range(width):
-            if maze[y][x] == 1:
-                line += "███"  # Full block wall
-            elif (x, y) == (1, 1):
-                line += " S "  # Start
-            elif (x, y) == (len(maze[0])-2, len(maze)-2):
-                line += " E "  # Exit
-            elif (x, y) in path_set:
-                line += "▓▓▓"  # DISTINCT solution path (not █)
-            else:
-                line += "   "  # Empty path
-        lines.append(line)
-    return lines
+    rows = _marked_rows(iter(maze), width, height, solution,
+                        getattr(maze, "start", None), getattr(maze, "goal", None))
+    if compact:
+        yield from _half_block_lines(rows, width)
+    else:
+        for row in rows:
+            yield row.decode("latin-1").translate(_GLYPHS)
+
+def render_maze(maze: MazeLike, solution: Optional[List[Tuple[int,int]]] = None,
+                compact: bool = False) -> List[str]:
+    """Clean Unicode rendering with PERFECT solution path."""
+    return list(iter_render_rows(maze, solution, compact))
+
+def write_rendered(lines: Iterable[str], out=None, batch: int = 256):
+    """Write lines to out (stdout by default), batch lines per write call."""
+    out = out or sys.stdout
+    buf = []
+    for line in lines:
+        buf.append(line.rstrip())
+        if len(buf) >= batch:
+            out.write("\n".join(buf) + "\n")
+            buf.clear()
+    if buf:
+        out.write("\n".join(buf) + "\n")
+    out.flush()
+
+def write_maze(maze: MazeLike, out=None, solution: Optional[List[Tuple[int,int]]] = None,
+               compact: bool = False):
+    """Render maze straight to a stream without holding all lines in memory."""
+    write_rendered(iter_render_rows(maze, solution, compact), out)
+
+def stream_render(rows: Iterable[bytes], width: int, height: int, out=None, compact: bool = False):
+    """Render rows as they arrive (e.g. from eller_rows), with the same glyphs as render_maze."""
+    marked = _marked_rows(rows, width, height)
+    if compact:
+        lines = _half_block_lines(marked, width)
+    else:
+        lines = (row.decode("latin-1").translate(_GLYPHS) for row in marked)
+    write_rendered(lines, out)
 
-def solve_maze(maze: List[List[int]]) -> List[Tuple[int,int]]:
-    """A* pathfinding with correct coordinates."""
+def _solve_astar(maze: MazeLike, start: Tuple[int,int], goal: Tuple[int,int]) -> List[Tuple[int,int]]:
+    """A* pathfinding with correct coordinates.
+
+    Reads cells through maze[y][x], so it works on a PackedMaze without
+    unpacking it.
+    """
     height, width = len(maze), len(maze[0])
-    start = (1, 1)
-    goal = (width-2, height-2)
     
     def heuristic(pos: Tuple[int,int]) -> int:
         return (abs(pos[0] - goal[0]) + abs(pos[1] - goal[1]))
@@ -92,13 +469,677 @@ def solve_maze(maze: List[List[int]]) -> List[Tuple[int,int]]:
     
     return []
 
-def save_maze(maze: List[List[int]], filename: str):
+# The flat solvers below work on a copy of the grid framed by one extra wall
+# on every side, indexed as (y + 1) * W + (x + 1) with W = width + 2, so a
+# cell's neighbours are always i ± 1 and i ± W with no bounds checks.
+
+def _framed_cells(maze: MazeLike) -> Tuple[bytearray, int]:
+    """Copy maze into a wall-framed flat grid; returns (cells, W)."""
+    maze = as_maze(maze)
+    w, h = maze.width, maze.height
+    W = w + 2
+    wall = bytes([WALL])
+    cells = bytearray(wall * W)
+    for y in range(h):
+        cells += wall + maze.cells[y * w:(y + 1) * w] + wall
+    cells += wall * W
+    return cells, W
+
+def _walk_down(depth: array, cur: int, W: int) -> List[int]:
+    """Follow decreasing depth from cur back to the depth-0 cell."""
+    path = [cur]
+    while depth[cur]:
+        want = depth[cur] - 1
+        for n in (cur - 1, cur + 1, cur - W, cur + W):
+            if depth[n] == want:
+                cur = n
+                break
+        path.append(cur)
+    return path
+
+def _bidirectional_bfs(cells: bytearray, W: int, s: int, g: int) -> List[int]:
+    """Breadth-first search from both ends, expanding the smaller frontier.
+
+    Only per-cell depths are stored (4 bytes per cell and side); the path is
+    recovered by walking down the depths from the meeting cell.
+    """
+    if cells[s] or cells[g]:
+        return []
+    n = len(cells)
+    depth_s = array("i", [-1]) * n
+    depth_g = array("i", [-1]) * n
+    depth_s[s] = depth_g[g] = 0
+    if s == g:
+        return [s]
+    front_s, front_g = [s], [g]
+    steps = (-1, 1, -W, W)
+    while front_s and front_g:
+        if len(front_s) <= len(front_g):
+            front, mine, other = front_s, depth_s, depth_g
+        else:
+            front, mine, other = front_g, depth_g, depth_s
+        # Finish the whole layer, keeping the best meeting cell seen in it
+        best, meet = -1, -1
+        nxt = []
+        for u in front:
+            du = mine[u] + 1
+            for d in steps:
+                v = u + d
+                if cells[v] or mine[v] >= 0:
+                    continue
+                mine[v] = du
+                nxt.append(v)
+                if other[v] >= 0 and (best < 0 or du + other[v] < best):
+                    best, meet = du + other[v], v
+        if meet >= 0:
+            return _walk_down(depth_s, meet, W)[::-1] + _walk_down(depth_g, meet, W)[1:]
+        if mine is depth_s:
+            front_s = nxt
+        else:
+            front_g = nxt
+    return []
+
+def _dead_end_filling(cells: bytearray, W: int, s: int, g: int) -> List[int]:
+    """Fill dead ends until only corridors between start and goal remain.
+
+    On a perfect maze the survivors are exactly the solution; otherwise the
+    remaining loops are searched with bidirectional BFS.
+    """
+    cells = bytearray(cells)
+    if cells[s] or cells[g]:
+        return []
+    n = len(cells)
+    steps = (-1, 1, -W, W)
+    # Open-neighbour count of every open cell
+    degree = bytearray(n)
+    open_cells = list(itertools.compress(range(n), cells.translate(_INVERT_CELL)))
+    stack = []
+    for i in open_cells:
+        k = 4 - cells[i - 1] - cells[i + 1] - cells[i - W] - cells[i + W]
+        degree[i] = k
+        if k <= 1 and i != s and i != g:
+            stack.append(i)
+    while stack:
+        i = stack.pop()
+        if cells[i]:
+            continue
+        cells[i] = WALL
+        for d in steps:
+            j = i + d
+            if not cells[j]:
+                degree[j] -= 1
+                if degree[j] == 1 and j != s and j != g:
+                    stack.append(j)
+    if cells[s] or cells[g]:
+        return []
+    return _bidirectional_bfs(cells, W, s, g)
+
+def _jump(cells: bytearray, W: int, i: int, d: int, goal: int) -> int:
+    """Jump from i in direction d; return the next jump point or -1 at a wall."""
+    horizontal = d in (1, -1)
+    while True:
+        i += d
+        if cells[i]:
+            return -1
+        if i == goal:
+            return i
+        if horizontal:
+            # Forced neighbour: a side opening that was closed one step back
+            if (not cells[i - W] and cells[i - W - d]) or (not cells[i + W] and cells[i + W - d]):
+                return i
+        else:
+            if (not cells[i - 1] and cells[i - 1 - d]) or (not cells[i + 1] and cells[i + 1 - d]):
+                return i
+            # Vertical moves stop wherever a horizontal jump finds something
+            if _jump(cells, W, i, 1, goal) >= 0 or _jump(cells, W, i, -1, goal) >= 0:
+                return i
+
+def _jump_point_search(cells: bytearray, W: int, s: int, g: int) -> List[int]:
+    """A* over jump points (4-connected JPS): straight runs are skipped in one step.
+
+    Best on open grids with few walls; in corridor mazes nearly every cell is
+    a jump point and it behaves like A*.
+    """
+    if cells[s] or cells[g]:
+        return []
+    gx, gy = g % W, g // W
+    n = len(cells)
+    best = array("l", [-1]) * n
+    parent = array("l", [-1]) * n
+    best[s] = 0
+    parent[s] = s
+    heap = [(abs(s % W - gx) + abs(s // W - gy), 0, s)]
+    while heap:
+        _, cost, i = heapq.heappop(heap)
+        if i == g:
+            # Expand straight segments between consecutive jump points
+            points = [i]
+            while i != s:
+                i = parent[i]
+                points.append(i)
+            points.reverse()
+            path = [s]
+            for a, b in zip(points, points[1:]):
+                step = (1 if b > a else -1) if a // W == b // W else (W if b > a else -W)
+                path.extend(range(a + step, b + step, step))
+            return path
+        if cost > best[i]:
+            continue
+        p = parent[i]
+        if p == i:
+            arrived = 0
+        elif p // W == i // W:
+            arrived = 1 if i > p else -1
+        else:
+            arrived = W if i > p else -W
+        for d in (1, -1, W, -W):
+            if d == -arrived:
+                continue  # never turn straight back
+            j = _jump(cells, W, i, d, g)
+            if j < 0:
+                continue
+            c = cost + abs(j - i) // (1 if abs(d) == 1 else W)
+            if best[j] < 0 or c < best[j]:
+                best[j] = c
+                parent[j] = i
+                heapq.heappush(heap, (c + abs(j % W - gx) + abs(j // W - gy), c, j))
+    return []
+
+# bytes 0/1 -> 1/0, to list open cells with itertools.compress
+_INVERT_CELL = bytes.maketrans(bytes([PATH, WALL]), bytes([WALL, PATH]))
+
+def _flat_solver(search):
+    """Adapt a flat-grid search to the (maze, start, goal) solver interface."""
+    def solve(maze: MazeLike, start: Tuple[int,int], goal: Tuple[int,int]) -> List[Tuple[int,int]]:
+        cells, W = _framed_cells(maze)
+        path = search(cells, W, (start[1] + 1) * W + start[0] + 1, (goal[1] + 1) * W + goal[0] + 1)
+        return [(i % W - 1, i // W - 1) for i in path]
+    solve.__doc__ = search.__doc__
+    return solve
+
+SOLVERS = {
+    "astar": _solve_astar,
+    "bibfs": _flat_solver(_bidirectional_bfs),
+    "deadend": _flat_solver(_dead_end_filling),
+    "jps": _flat_solver(_jump_point_search),
+}
+
+def solve_maze(maze: MazeLike, solver: str = "astar", start: Optional[Tuple[int,int]] = None,
+               goal: Optional[Tuple[int,int]] = None) -> List[Tuple[int,int]]:
+    """Shortest path from start to goal (default (1,1) to (w-2,h-2)) with one of SOLVERS.
+
+    A PackedMaze supplies the endpoints stored in its file as the defaults.
+    Returns the cells of the path including both ends, or [] if there is none.
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"unknown solver '{solver}' (choose from {', '.join(SOLVERS)})")
+    height, width = len(maze), len(maze[0])
+    start = start or getattr(maze, "start", (1, 1))
+    goal = goal or getattr(maze, "goal", (width-2, height-2))
+    for x, y in (start, goal):
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"cell ({x}, {y}) is outside the maze")
+        if maze[y][x] == WALL:
+            return []
+    return SOLVERS[solver](maze, start, goal)
+
+# bytes 0/1 -> ASCII "0"/"1" and back, for converting rows without int lists
+_CELL_TO_ASCII = bytes.maketrans(bytes([PATH, WALL]), b"01")
+_ASCII_TO_CELL = bytes.maketrans(b"01", bytes([PATH, WALL]))
+
+# --- Binary maze format ---
+#
+# Header (little-endian, 48 bytes): magic "MAZB", version, flags, width,
+# height, start x/y, goal x/y, number of solution cells, reserved. The body
+# follows: one bit per cell (1 = wall), each row padded to whole bytes, least
+# significant bit first. With FLAG_SOLUTION the solution follows the body as
+# (x, y) uint32 pairs.
+MAZE_MAGIC = b"MAZB"
+MAZE_VERSION = 1
+FLAG_ENDPOINTS = 1
+FLAG_SOLUTION = 2
+_HEADER = struct.Struct("<4sHHIIIIIIQ8x")
+
+# Extensions saved in the binary format; anything else is saved as JSON
+BINARY_EXTENSIONS = (".mzb", ".bin")
+
+def _pack_row(row) -> bytes:
+    """Pack a row of 0/1 bytes into bits, least significant bit first."""
+    row_bytes = (len(row) + 7) // 8
+    bits = int(bytes(row)[::-1].translate(_CELL_TO_ASCII), 2)
+    return bits.to_bytes(row_bytes, "little")
+
+def _unpack_row(packed: bytes, width: int) -> bytes:
+    """Inverse of _pack_row: one 0/1 byte per cell."""
+    nbits = 8 * len(packed)
+    bits = bin(int.from_bytes(packed, "little") | (1 << nbits))[3:]
+    return bits[::-1].encode().translate(_ASCII_TO_CELL)[:width]
+
+class PackedMaze:
+    """Read-only maze backed by a memory-mapped binary maze file.
+
+    Cells are decoded on access, so opening is instant and a solver only
+    pulls in the pages of the rows it actually visits. maze[y][x] and len()
+    work as for Maze; unpack() copies everything into a Maze.
+    """
+
+    def __init__(self, filename: str):
+        with open(filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"{filename}: not a binary maze file")
+        (magic, version, flags, self.width, self.height, sx, sy, gx, gy,
+         self._solution_len) = _HEADER.unpack_from(self._mmap)
+        if magic != MAZE_MAGIC or version != MAZE_VERSION:
+            raise ValueError(f"{filename}: not a binary maze file")
+        self.row_bytes = (self.width + 7) // 8
+        self._body = _HEADER.size
+        if len(self._mmap) < self._body + self.row_bytes * self.height:
+            raise ValueError(f"{filename}: truncated maze file")
+        self.start = (sx, sy) if flags & FLAG_ENDPOINTS else (1, 1)
+        self.goal = (gx, gy) if flags & FLAG_ENDPOINTS else (self.width - 2, self.height - 2)
+        self._has_solution = bool(flags & FLAG_SOLUTION)
+
+    def is_wall(self, x: int, y: int) -> bool:
+        byte = self._mmap[self._body + y * self.row_bytes + (x >> 3)]
+        return bool(byte >> (x & 7) & 1)
+
+    def row(self, y: int) -> bytes:
+        """Row y decoded to one 0/1 byte per cell."""
+        off = self._body + y * self.row_bytes
+        return _unpack_row(self._mmap[off:off + self.row_bytes], self.width)
+
+    def unpack(self) -> Maze:
+        cells = bytearray()
+        for y in range(self.height):
+            cells += self.row(y)
+        return Maze(self.width, self.height, cells)
+
+    def solution(self) -> Optional[List[Tuple[int, int]]]:
+        """The stored solution path, or None if the file has none."""
+        if not self._has_solution:
+            return None
+        off = self._body + self.row_bytes * self.height
+        coords = array("I")
+        coords.frombytes(self._mmap[off:off + 8 * self._solution_len])
+        if sys.byteorder != "little":
+            coords.byteswap()
+        return list(zip(coords[::2], coords[1::2]))
+
+    def close(self):
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> "_PackedRow":
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError("maze row out of range")
+        return _PackedRow(self, y)
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield self.row(y)
+
+class _PackedRow:
+    """maze[y] of a PackedMaze: decodes single cells on demand."""
+    __slots__ = ("_maze", "_y")
+
+    def __init__(self, maze: PackedMaze, y: int):
+        self._maze, self._y = maze, y
+
+    def __len__(self) -> int:
+        return self._maze.width
+
+    def __getitem__(self, x: int) -> int:
+        if x < 0:
+            x += self._maze.width
+        if not 0 <= x < self._maze.width:
+            raise IndexError("maze column out of range")
+        return int(self._maze.is_wall(x, self._y))
+
+def _binary_header(width: int, height: int, start: Tuple[int, int], goal: Tuple[int, int],
+                   solution_len: Optional[int] = None) -> bytes:
+    flags = FLAG_ENDPOINTS | (FLAG_SOLUTION if solution_len is not None else 0)
+    return _HEADER.pack(MAZE_MAGIC, MAZE_VERSION, flags, width, height,
+                        start[0], start[1], goal[0], goal[1], solution_len or 0)
+
+def _write_solution(f, solution: List[Tuple[int, int]]):
+    coords = array("I", (c for cell in solution for c in cell))
+    if sys.byteorder != "little":
+        coords.byteswap()
+    f.write(coords.tobytes())
+
+def save_maze_binary(maze: MazeLike, filename: str,
+                     solution: Optional[List[Tuple[int, int]]] = None,
+                     start: Optional[Tuple[int, int]] = None,
+                     goal: Optional[Tuple[int, int]] = None):
+    """Save in the binary format, optionally with a solution path.
+
+    start and goal are stored in the header and become the defaults when the
+    file is solved or rendered; they default to the maze's own (if it is a
+    PackedMaze) or the corners.
+    """
+    with open(filename, "wb") as f:
+        _write_binary(f, maze, solution, start, goal)
+
+def _write_binary(f, maze: MazeLike, solution: Optional[List[Tuple[int, int]]] = None,
+                  start: Optional[Tuple[int, int]] = None,
+                  goal: Optional[Tuple[int, int]] = None):
+    if not isinstance(maze, (Maze, PackedMaze)):
+        maze = Maze.from_rows(maze)
+    width, height = maze.width, len(maze)
+    start = start or getattr(maze, "start", (1, 1))
+    goal = goal or getattr(maze, "goal", (width - 2, height - 2))
+    f.write(_binary_header(width, height, start, goal,
+                           len(solution) if solution is not None else None))
+    for row in maze:
+        f.write(_pack_row(row))
+    if solution is not None:
+        _write_solution(f, solution)
+
+def write_maze_rows(rows: Iterable[bytes], filename: str, width: int, height: int):
+    """Write a binary maze file from rows produced one at a time (e.g. eller_rows)."""
+    with open(filename, "wb") as f:
+        f.write(_binary_header(width, height, (1, 1), (width - 2, height - 2)))
+        count = 0
+        for row in rows:
+            f.write(_pack_row(row))
+            count += 1
+    if count != height:
+        raise ValueError(f"expected {height} rows, got {count}")
+
+def save_maze(maze: MazeLike, filename: str,
+              solution: Optional[List[Tuple[int, int]]] = None):
+    """Save a maze: binary for BINARY_EXTENSIONS, otherwise a JSON list of rows.
+
+    Only the binary format can store the solution.
+    """
+    if filename.lower().endswith(BINARY_EXTENSIONS):
+        save_maze_binary(maze, filename, solution)
+        return
     with open(filename, 'w') as f:
-        json.dump(maze, f)
+        f.write("[")
+        for y, row in enumerate(maze):
+            digits = bytes(row).translate(_CELL_TO_ASCII).decode()
+            f.write(("," if y else "") + "[" + ",".join(digits) + "]")
+        f.write("]")
 
-def load_maze(filename: str) -> List[List[int]]:
+def load_maze(filename: str) -> Union[Maze, PackedMaze]:
+    """Load a maze; binary files are memory-mapped, JSON files are parsed into a Maze."""
+    with open(filename, 'rb') as f:
+        magic = f.read(len(MAZE_MAGIC))
+    if magic == MAZE_MAGIC:
+        return PackedMaze(filename)
     with open(filename, 'r') as f:
-        return json.load(f)
+        return Maze.from_rows(json.load(f))
+
+# --- Path oracle ---
+#
+# Index file (little-endian): 40-byte header (magic "MZIX", version, flags,
+# width, height, root x/y, size and mtime of the maze file it was built
+# from), then BFS depth and parent arrays as int32 over the wall-framed grid.
+INDEX_MAGIC = b"MZIX"
+INDEX_VERSION = 1
+INDEX_FLAG_TREE = 1
+_INDEX_HEADER = struct.Struct("<4sHHIIIIQQ")
+
+def index_path_for(maze_filename: str) -> str:
+    """Where the oracle index of a saved maze is cached."""
+    return maze_filename + ".idx"
+
+class PathOracle:
+    """Answers many shortest-path queries on one maze from a single BFS.
+
+    build() runs one BFS from root and keeps, per cell, its depth and its
+    parent in the BFS tree. On a perfect maze that tree is the maze itself,
+    so the path between any two cells goes through their lowest common
+    ancestor and is found by climbing parents: O(path length) per query.
+    Mazes with loops or several regions fall back to bidirectional BFS for
+    queries not starting or ending at the root.
+    """
+
+    def __init__(self, width: int, height: int, root: Tuple[int, int], is_tree: bool,
+                 depth, parent, cells: Optional[bytearray] = None):
+        self.width, self.height = width, height
+        self.root = root
+        self.is_tree = is_tree
+        self._W = width + 2
+        self._depth = depth
+        self._parent = parent
+        self._cells = cells  # framed grid, only needed for loopy mazes
+
+    @classmethod
+    def build(cls, maze: MazeLike, root: Optional[Tuple[int, int]] = None) -> "PathOracle":
+        cells, W = _framed_cells(maze)
+        width, height = W - 2, len(cells) // W - 2
+        root = root or (1, 1)
+        r = (root[1] + 1) * W + root[0] + 1
+        if cells[r]:
+            raise ValueError(f"root ({root[0]}, {root[1]}) is a wall")
+        n = len(cells)
+        depth = array("i", [-1]) * n
+        parent = array("i", [-1]) * n
+        depth[r], parent[r] = 0, r
+        frontier = [r]
+        nodes, edges2 = 0, 0  # reachable cells, and open-neighbour pairs counted twice
+        steps = (-1, 1, -W, W)
+        while frontier:
+            nxt = []
+            for u in frontier:
+                nodes += 1
+                du = depth[u] + 1
+                for d in steps:
+                    v = u + d
+                    if cells[v]:
+                        continue
+                    edges2 += 1
+                    if depth[v] < 0:
+                        depth[v], parent[v] = du, u
+                        nxt.append(v)
+            frontier = nxt
+        # A tree spanning every open cell: the maze is perfect
+        is_tree = edges2 // 2 == nodes - 1 and nodes == cells.count(PATH)
+        return cls(width, height, root, is_tree, depth, parent, None if is_tree else cells)
+
+    def _index(self, cell: Tuple[int, int]) -> int:
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"cell ({x}, {y}) is outside the maze")
+        return (y + 1) * self._W + x + 1
+
+    def _lca(self, a: int, b: int) -> int:
+        depth, parent = self._depth, self._parent
+        while depth[a] > depth[b]:
+            a = parent[a]
+        while depth[b] > depth[a]:
+            b = parent[b]
+        while a != b:
+            a, b = parent[a], parent[b]
+        return a
+
+    def _tree_path(self, a: int, b: int) -> List[int]:
+        lca = self._lca(a, b)
+        up, down = [], []
+        while a != lca:
+            up.append(a)
+            a = self._parent[a]
+        while b != lca:
+            down.append(b)
+            b = self._parent[b]
+        return up + [lca] + down[::-1]
+
+    def distance(self, a: Tuple[int, int], b: Tuple[int, int]) -> int:
+        """Steps on a shortest path from a to b, or -1 if there is none."""
+        path = self.path(a, b)
+        return len(path) - 1
+
+    def path(self, a: Tuple[int, int], b: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Shortest path from a to b including both ends, or [] if unreachable."""
+        i, j = self._index(a), self._index(b)
+        reachable = self._depth[i] >= 0 and self._depth[j] >= 0
+        if self.is_tree and not reachable:
+            return []  # every open cell is in the tree, so one of them is a wall
+        root = self._index(self.root)
+        if reachable and (self.is_tree or root in (i, j)):
+            cells = self._tree_path(i, j)
+        else:
+            cells = _bidirectional_bfs(self._cells, self._W, i, j)
+        W = self._W
+        return [(c % W - 1, c // W - 1) for c in cells]
+
+    def save(self, filename: str, maze_filename: Optional[str] = None):
+        """Write the index; maze_filename ties it to that file's size and mtime."""
+        size, mtime = _file_stamp(maze_filename) if maze_filename else (0, 0)
+        flags = INDEX_FLAG_TREE if self.is_tree else 0
+        with open(filename, "wb") as f:
+            f.write(_INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, flags, self.width, self.height,
+                                       self.root[0], self.root[1], size, mtime))
+            for arr in (self._depth, self._parent):
+                arr = array("i", arr)
+                if sys.byteorder != "little":
+                    arr.byteswap()
+                f.write(arr.tobytes())
+
+    @classmethod
+    def load(cls, filename: str, maze_filename: Optional[str] = None) -> Optional["PathOracle"]:
+        """Map a saved index; None if it is missing, stale or not an index file."""
+        try:
+            with open(filename, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(mm) < _INDEX_HEADER.size:
+            return None
+        magic, version, flags, width, height, rx, ry, size, mtime = _INDEX_HEADER.unpack_from(mm)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            return None
+        if maze_filename and (size, mtime) != _file_stamp(maze_filename):
+            return None
+        n = (width + 2) * (height + 2)
+        off = _INDEX_HEADER.size
+        if len(mm) < off + 8 * n:
+            return None
+        if sys.byteorder == "little":
+            # Zero-copy int32 views straight over the mapped file
+            view = memoryview(mm)
+            depth = view[off:off + 4 * n].cast("i")
+            parent = view[off + 4 * n:off + 8 * n].cast("i")
+        else:
+            depth, parent = array("i"), array("i")
+            depth.frombytes(mm[off:off + 4 * n])
+            parent.frombytes(mm[off + 4 * n:off + 8 * n])
+            depth.byteswap()
+            parent.byteswap()
+        return cls(width, height, (rx, ry), bool(flags & INDEX_FLAG_TREE), depth, parent)
+
+    @classmethod
+    def for_file(cls, maze_filename: str, root: Optional[Tuple[int, int]] = None,
+                 cache: bool = True) -> "PathOracle":
+        """Oracle for a saved maze, reusing (or writing) its cached index."""
+        index_file = index_path_for(maze_filename)
+        oracle = cls.load(index_file, maze_filename) if cache else None
+        if oracle is not None and root is not None and oracle.root != root:
+            oracle = None
+        if oracle is None or not oracle.is_tree:
+            maze = load_maze(maze_filename)
+            if oracle is not None:
+                oracle._cells = _framed_cells(maze)[0]
+            else:
+                oracle = cls.build(maze, root)
+                if cache:
+                    oracle.save(index_file, maze_filename)
+        return oracle
+
+def _file_stamp(filename: str) -> Tuple[int, int]:
+    st = os.stat(filename)
+    return st.st_size, st.st_mtime_ns
+
+def _parse_cell(text: str) -> Tuple[int, int]:
+    """Parse "x,y" into a cell."""
+    try:
+        x, y = map(int, text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected x,y, got '{text}'")
+    return x, y
+
+# ============================================================
+# BATCH: many mazes across a process pool, one archive out
+# ============================================================
+
+def batch_seed(seed: int, index: int) -> int:
+    """Seed of maze number index; `gen --seed` with it reproduces that maze."""
+    return seed + index
+
+def _batch_chunk(indices: List[int], width: int, height: int, algo: str,
+                 solver: Optional[str], seed: int) -> List[Tuple[dict, bytes]]:
+    """Generate (and solve) the mazes of one chunk; returns (summary, .mzb bytes) pairs."""
+    results = []
+    for index in indices:
+        maze_seed = batch_seed(seed, index)
+        t0 = time.perf_counter()
+        maze = generate_maze(width, height, algo, random.Random(maze_seed))
+        t1 = time.perf_counter()
+        solution = solve_maze(maze, solver) if solver else None
+        t2 = time.perf_counter()
+        buf = io.BytesIO()
+        _write_binary(buf, maze, solution)
+        record = {
+            "index": index,
+            "file": f"maze-{index:06d}.mzb",
+            "seed": maze_seed,
+            "algo": algo,
+            "width": maze.width,
+            "height": maze.height,
+            "solver": solver,
+            "path_length": len(solution) - 1 if solution else None,
+            "gen_ms": round((t1 - t0) * 1000, 3),
+            "solve_ms": round((t2 - t1) * 1000, 3) if solver else None,
+            "bytes": buf.tell(),
+        }
+        results.append((record, buf.getvalue()))
+    return results
+
+def run_maze_batch(count: int, width: int, height: int, archive: str,
+                   algo: str = "backtracker", solver: Optional[str] = "astar",
+                   seed: int = 0, summary=None, workers: Optional[int] = None,
+                   chunk_size: int = 8) -> int:
+    """Generate count mazes in parallel into a zip archive of .mzb files.
+
+    Each maze gets its own seed (batch_seed), so results do not depend on the
+    number of workers. Entries are written in index order and one JSON line per
+    maze goes to summary. At most two chunks per worker are in flight.
+    """
+    workers = workers or os.cpu_count() or 1
+    context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    chunks = (list(range(i, min(i + chunk_size, count))) for i in range(0, count, chunk_size))
+    pending = collections.deque()
+    written = 0
+
+    def drain(future):
+        nonlocal written
+        for record, data in future.result():
+            zf.writestr(record["file"], data)
+            if summary is not None:
+                summary.write(json.dumps(record) + "\n")
+            written += 1
+
+    # Packed rows are already 1 bit per cell, so entries are stored uncompressed
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED, allowZip64=True) as zf, \
+         ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        for chunk in chunks:
+            pending.append(pool.submit(_batch_chunk, chunk, width, height, algo, solver, seed))
+            if len(pending) >= 2 * workers:
+                drain(pending.popleft())
+        while pending:
+            drain(pending.popleft())
+    if summary is not None:
+        summary.flush()
+    return written
 
 def main():
     parser = argparse.ArgumentParser(description="Maze Generator & Solver")
@@ -106,42 +1147,86 @@ def main():
     
     gen_parser = subparsers.add_parser("gen")
     gen_parser.add_argument("size", help="WIDTHxHEIGHT")
+    gen_parser.add_argument("--algo", choices=sorted(ALGORITHMS), default="backtracker")
+    gen_parser.add_argument("--compact", action="store_true",
+                            help="Half-block rendering: two rows per line, one character per cell")
+    gen_parser.add_argument("--stream", action="store_true",
+                            help="Generate row by row with Eller's algorithm in O(width) memory")
+    gen_parser.add_argument("--seed", type=int, help="Seed for a reproducible maze")
     gen_parser.add_argument("--solve", action="store_true")
-    gen_parser.add_argument("--save")
+    gen_parser.add_argument("--solver", choices=sorted(SOLVERS), default="astar")
+    gen_parser.add_argument("--save", help="Output file (.mzb/.bin = binary, otherwise JSON)")
     
     solve_parser = subparsers.add_parser("solve")
     solve_parser.add_argument("filename")
+    solve_parser.add_argument("--compact", action="store_true",
+                              help="Half-block rendering: two rows per line, one character per cell")
+    solve_parser.add_argument("--solver", choices=sorted(SOLVERS), default="astar",
+                              help="astar (default), bibfs, deadend or jps")
+    
+    query_parser = subparsers.add_parser("query", help="Shortest paths between many cell pairs")
+    query_parser.add_argument("filename")
+    query_parser.add_argument("cells", nargs="+", type=_parse_cell, metavar="X,Y",
+                              help="Pairs of cells: FROM TO [FROM TO ...]")
+    query_parser.add_argument("--root", type=_parse_cell, metavar="X,Y",
+                              help="BFS root of the index (default 1,1)")
+    query_parser.add_argument("--no-cache", action="store_true",
+                              help="Do not read or write the FILE.idx index")
+    query_parser.add_argument("--path", action="store_true", help="Print the cells of each path")
+    
+    batch_parser = subparsers.add_parser("batch", help="Generate and solve many mazes in parallel")
+    batch_parser.add_argument("count", type=int, help="Number of mazes")
+    batch_parser.add_argument("size", help="WIDTHxHEIGHT")
+    batch_parser.add_argument("archive", help="Output zip archive of .mzb files")
+    batch_parser.add_argument("--algo", choices=sorted(ALGORITHMS), default="backtracker")
+    batch_parser.add_argument("--solver", choices=sorted(SOLVERS), default="astar")
+    batch_parser.add_argument("--no-solve", action="store_true", help="Only generate")
+    batch_parser.add_argument("--seed", type=int, default=0,
+                              help="Base seed; maze i uses SEED+i (default 0)")
+    batch_parser.add_argument("--summary", help="JSON-lines summary file (default: stdout)")
+    batch_parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    batch_parser.add_argument("--chunk-size", type=int, default=8, help="Mazes per worker task")
     
     args = parser.parse_args()
     
     try:
         if args.command == "gen":
             w, h = map(int, args.size.split('x'))
-            maze = generate_maze(w, h)
+            rng = random.Random(args.seed) if args.seed is not None else None
+            if args.stream:
+                if args.solve:
+                    parser.error("--stream cannot be combined with --solve")
+                if args.save and not args.save.lower().endswith(BINARY_EXTENSIONS):
+                    parser.error("--stream saves only binary files (.mzb/.bin)")
+                w, h = _odd_size(w, h)
+                rows = eller_rows(w, h, rng)
+                if args.save:
+                    write_maze_rows(rows, args.save, w, h)
+                    print(f"Saved: {args.save}")
+                else:
+                    stream_render(rows, w, h, compact=args.compact)
+                return
+            maze = generate_maze(w, h, args.algo, rng)
             
             print("\n" + "═" * 50)
             print(f"MAZE: {w}x{h}")
             print("═" * 50)
             
-            lines = render_maze(maze)
-            for line in lines:
-                print(line.rstrip())
+            write_maze(maze, compact=args.compact)
             
             if args.solve:
                 print("\n" + "═" * 50)
                 print("SOLUTION:")
                 print("═" * 50)
-                solution = solve_maze(maze)
+                solution = solve_maze(maze, args.solver)
                 if solution:
-                    lines = render_maze(maze, solution)
-                    for line in lines:
-                        print(line.rstrip())
+                    write_maze(maze, solution=solution, compact=args.compact)
                     print(f"\n✅ Path: {len(solution)-1} steps ✓")
                 else:
                     print("❌ No path found")
             
             if args.save:
-                save_maze(maze, args.save)
+                save_maze(maze, args.save, solution if args.solve else None)
                 print(f"Saved: {args.save}")
                 
         elif args.command == "solve":
@@ -149,19 +1234,48 @@ def main():
             print("\n" + "═" * 50)
             print("ORIGINAL MAZE:")
             print("═" * 50)
-            for line in render_maze(maze):
-                print(line.rstrip())
+            write_maze(maze, compact=args.compact)
             
-            solution = solve_maze(maze)
+            # Binary files may carry the solution already
+            stored = maze.solution() if isinstance(maze, PackedMaze) else None
+            solution = stored or solve_maze(maze, args.solver)
             if solution:
                 print("\n" + "═" * 50)
                 print("SOLUTION:")
                 print("═" * 50)
-                for line in render_maze(maze, solution):
-                    print(line.rstrip())
+                write_maze(maze, solution=solution, compact=args.compact)
                 print(f"✅ Path: {len(solution)-1} steps")
             else:
                 print("❌ No solution")
+        elif args.command == "batch":
+            w, h = map(int, args.size.split('x'))
+            if args.count < 0 or args.chunk_size < 1:
+                parser.error("count must be >= 0 and --chunk-size >= 1")
+            solver = None if args.no_solve else args.solver
+            if args.summary:
+                with open(args.summary, "w") as summary:
+                    n = run_maze_batch(args.count, w, h, args.archive, args.algo, solver,
+                                       args.seed, summary, args.workers, args.chunk_size)
+                print(f"Saved: {args.archive} ({n} mazes), summary: {args.summary}")
+            else:
+                run_maze_batch(args.count, w, h, args.archive, args.algo, solver,
+                               args.seed, sys.stdout, args.workers, args.chunk_size)
+        elif args.command == "query":
+            if len(args.cells) % 2:
+                parser.error("cells must come in FROM TO pairs")
+            oracle = PathOracle.for_file(args.filename, args.root, cache=not args.no_cache)
+            for a, b in zip(args.cells[::2], args.cells[1::2]):
+                path = oracle.path(a, b)
+                if not path:
+                    print(f"{a} -> {b}: ❌ no path")
+                    continue
+                print(f"{a} -> {b}: {len(path)-1} steps")
+                if args.path:
+                    print(" ".join(f"{x},{y}" for x, y in path))
+    except BrokenPipeError:
+        # Downstream closed the pipe (e.g. `| head`); stop quietly
+        sys.stdout = open(os.devnull, "w")
+        sys.exit(0)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for primes_toolkit.py
+Usage: python primes_benchmark.py [--quick] [--only NAME ...] [--json FILE] [--compare FILE]
+
+Runs a fixed set of workloads with a fixed seed so numbers are comparable
+between runs:
+  sieve-1e6/1e7/1e8   - sieve_of_eratosthenes up to N
+  factor-<bits>       - factorize semiprimes with two bits/2-bit prime factors
+  isprime-64/512      - is_prime_optimized on random odd 64- and 512-bit numbers
+  miller-rabin-64     - miller_rabin with the 64-bit witness set
+
+Each workload runs in a fresh worker process so its peak RSS is its own.
+Reported per workload: ops/sec, p50/p99 latency and peak RSS; --json
+writes the same data (plus environment details) for later --compare.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is reported as null
+    resource = None
+
+import primes_toolkit as pt
+
+DEFAULT_SEED = 20240101
+
+def _random_prime(rng, bits):
+    """Random prime with exactly the given number of bits."""
+    while True:
+        n = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if pt.is_prime_optimized(n):
+            return n
+
+def _random_odd(rng, bits, count):
+    return [rng.getrandbits(bits) | (1 << (bits - 1)) | 1 for _ in range(count)]
+
+# name -> (function under test, inputs builder(rng, quick)); each input is one op
+WORKLOADS = {
+    "sieve-1e6": (lambda n, backend: pt.sieve_of_eratosthenes(n, backend),
+                  lambda rng, quick: [10**6] * (3 if quick else 10)),
+    "sieve-1e7": (lambda n, backend: pt.sieve_of_eratosthenes(n, backend),
+                  lambda rng, quick: [10**7] * (1 if quick else 3)),
+    "sieve-1e8": (lambda n, backend: pt.sieve_of_eratosthenes(n, backend),
+                  lambda rng, quick: [10**8] * 1),
+    "factor-40": (lambda n, backend: pt.factorize(n),
+                  lambda rng, quick: [_random_prime(rng, 20) * _random_prime(rng, 20)
+                                      for _ in range(20 if quick else 200)]),
+    "factor-64": (lambda n, backend: pt.factorize(n),
+                  lambda rng, quick: [_random_prime(rng, 32) * _random_prime(rng, 32)
+                                      for _ in range(5 if quick else 50)]),
+    "factor-80": (lambda n, backend: pt.factorize(n),
+                  lambda rng, quick: [_random_prime(rng, 40) * _random_prime(rng, 40)
+                                      for _ in range(2 if quick else 10)]),
+    "factor-100": (lambda n, backend: pt.factorize(n),
+                   lambda rng, quick: [_random_prime(rng, 50) * _random_prime(rng, 50)
+                                       for _ in range(1 if quick else 5)]),
+    "isprime-64": (lambda n, backend: pt.is_prime_optimized(n),
+                   lambda rng, quick: _random_odd(rng, 64, 2000 if quick else 20000)),
+    "isprime-512": (lambda n, backend: pt.is_prime_optimized(n),
+                    lambda rng, quick: _random_odd(rng, 512, 200 if quick else 2000)),
+    "miller-rabin-64": (lambda n, backend: pt.miller_rabin(n, pt._MR_64BIT_WITNESSES),
+                        lambda rng, quick: _random_odd(rng, 64, 2000 if quick else 20000)),
+}
+
+# Workloads skipped by --quick
+SLOW_WORKLOADS = {"sieve-1e8", "factor-100"}
+
+def _peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def run_workload(name, seed, quick, backend):
+    """Run one workload in the current process and return its measurements."""
+    func, build_inputs = WORKLOADS[name]
+    rng = random.Random("{}:{}".format(seed, name))
+    inputs = build_inputs(rng, quick)
+    latencies = []
+    start = time.perf_counter()
+    for value in inputs:
+        t0 = time.perf_counter_ns()
+        func(value, backend)
+        latencies.append(time.perf_counter_ns() - t0)
+    total = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "name": name,
+        "ops": len(inputs),
+        "seconds": total,
+        "ops_per_sec": len(inputs) / total if total else None,
+        "p50_ms": _percentile(latencies, 50) / 1e6,
+        "p99_ms": _percentile(latencies, 99) / 1e6,
+        "mean_ms": statistics.fmean(latencies) / 1e6,
+        "peak_rss_bytes": _peak_rss_bytes(),
+    }
+
+def _environment(args):
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": pt.np.__version__ if pt.np is not None else None,
+        "backend": pt._resolve_backend(args.backend),
+        "seed": args.seed,
+        "quick": args.quick,
+    }
+
+def _print_row(result, baseline=None):
+    rss = result["peak_rss_bytes"]
+    line = "{:<16} {:>8} {:>12.1f} {:>10.3f} {:>10.3f} {:>9}".format(
+        result["name"], result["ops"], result["ops_per_sec"],
+        result["p50_ms"], result["p99_ms"],
+        "{:.1f}".format(rss / 2**20) if rss is not None else "-")
+    if baseline:
+        line += "  {:>6.2f}x".format(result["ops_per_sec"] / baseline["ops_per_sec"])
+    print(line, flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark primes_toolkit algorithms")
+    parser.add_argument("--only", nargs="+", choices=sorted(WORKLOADS), metavar="NAME",
+                        help="Run only these workloads")
+    parser.add_argument("--quick", action="store_true",
+                        help="Fewer repetitions and no 1e8 sieve / 100-bit factoring")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Input generation seed")
+    parser.add_argument("--backend", choices=pt.BACKENDS, default="auto", help="Sieve backend")
+    parser.add_argument("--json", metavar="FILE", help="Write results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="Show speedup against an earlier --json run")
+    args = parser.parse_args()
+
+    names = args.only or [n for n in WORKLOADS if not (args.quick and n in SLOW_WORKLOADS)]
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {r["name"]: r for r in json.load(f)["results"]}
+
+    header = "{:<16} {:>8} {:>12} {:>10} {:>10} {:>9}".format(
+        "workload", "ops", "ops/sec", "p50 ms", "p99 ms", "RSS MiB")
+    if baseline:
+        header += "  {:>7}".format("vs base")
+    print(header)
+    print("-" * len(header))
+
+    results = []
+    for name in names:
+        # A fresh process per workload keeps peak RSS and warm caches separate
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            result = pool.submit(run_workload, name, args.seed, args.quick, args.backend).result()
+        results.append(result)
+        _print_row(result, baseline.get(name))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": _environment(args), "results": results}, f, indent=2)
+        print("Saved: {}".format(args.json))
+
+if __name__ == "__main__":
+    main()
@@ -1,70 +1,616 @@
 #!/usr/bin/env python3
 """
 Prime Number Toolkit CLI
-Usage: python primes_toolkit.py {gen|factor|isprime} [args]
+Usage: python primes_toolkit.py {gen|factor|isprime|count|nth} [args]
 
 Subcommands:
-  gen N         - Generate primes up to N using Sieve of Eratosthenes
-  factor N      - Factorize N via trial division
-  isprime N     - Check if N is prime (optimized for large N)
+  gen N         - Generate primes up to N using a segmented Sieve of Eratosthenes
+  gen --from A --to B
+                - Generate primes in [A, B], sieving only that window
+  factor N      - Factorize N (trial division, Pollard-Brent rho, ECM)
+  isprime N     - Check if N is prime (Miller-Rabin below 2**64, BPSW above)
+  count N       - Count primes <= N (Lucy_Hedgehog, no enumeration)
+  nth K         - Print the K-th prime
+  factor --batch FILE, isprime --batch FILE
+                - Process one integer per token from FILE ('-' = stdin) in parallel
+
+Global options:
+  --backend {auto,numpy,python}
+                - Force the pure-Python sieve, or the NumPy wheel sieve (auto default)
+  --cache [PATH], --cache-limit N
+                - Keep sieved primes in a memory-mapped file that later runs reuse
 """
 
 import argparse
+import bisect
+import collections
+import os
 import sys
 import math
+import mmap
+import struct
+import itertools
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
 
-def sieve_of_eratosthenes(n):
-    """Generate list of primes up to n using Sieve."""
-    if n < 2:
+# NumPy is optional; when it is installed the "numpy" backend (wheel sieve,
+# vectorized prime counting) is picked automatically
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Odd numbers covered by one sieve segment. One byte per odd number, so a
+# segment is 256 KiB and stays resident in L2 cache while it is crossed off.
+SEGMENT_SIZE = 1 << 18
+
+def _chunked(iterable, size):
+    """Yield lists of up to size items from iterable."""
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _base_primes(limit):
+    """Return primes up to limit with a small odd-only bytearray sieve."""
+    if limit < 2:
         return []
-    is_prime = [True] * (n + 1)
-    is_prime[0] = is_prime[1] = False
-    for i in range(2, int(math.sqrt(n)) + 1):
-        if is_prime[i]:
-            for j in range(i*i, n+1, i):
-                is_prime[j] = False
-    return [i for i in range(2, n+1) if is_prime[i]]
+    # Index i stands for the odd number 2*i + 1
+    size = (limit - 1) // 2 + 1
+    flags = bytearray([1]) * size
+    flags[0] = 0
+    for i in range(1, (math.isqrt(limit) - 1) // 2 + 1):
+        if flags[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            flags[start::p] = bytes(len(range(start, size, p)))
+    return [2] + [2 * i + 1 for i in range(1, size) if flags[i]]
+
+def _segment_flags(lo, hi, base):
+    """Sieve the odd numbers in [lo, hi) for odd lo; flag i stands for lo + 2*i.
+
+    base must hold the odd primes up to sqrt(hi - 1) in increasing order.
+    """
+    size = (hi - lo + 1) // 2
+    seg = bytearray([1]) * size
+    for p in base:
+        start = p * p
+        if start >= hi:
+            break
+        if start < lo:
+            # First odd multiple of p that is >= lo
+            start = -(-lo // p) * p
+            if start % 2 == 0:
+                start += p
+        idx = (start - lo) // 2
+        seg[idx::p] = bytes(len(range(idx, size, p)))
+    if lo == 1:
+        seg[0] = 0
+    return seg
+
+def _sieve_segment(lo, hi, base):
+    """Return an iterator over primes in [lo, hi) for odd lo."""
+    return itertools.compress(range(lo, hi, 2), _segment_flags(lo, hi, base))
+
+def primes_in_range(a, b, segment_size=SEGMENT_SIZE, backend="auto"):
+    """Yield primes p with a <= p <= b, sieving only the window [a, b].
+
+    Only base primes up to sqrt(b) are computed, and the window is crossed
+    off one cache-sized odd-only segment at a time, so memory stays bounded
+    however wide or far out the range is.
+    """
+    a = max(a, 2)
+    if b < 2 or a > b:
+        return
+    if _prime_cache is not None:
+        covered = _prime_cache.limit
+        # Only grow the cache when the gap up to a costs no more than the
+        # window itself; a far-out window is cheaper to sieve on its own
+        if a - covered <= b - a + 1:
+            covered = _prime_cache.ensure(b)
+        if a <= covered:
+            yield from _prime_cache.primes(a, min(b, covered))
+            a = covered + 1
+            if a > b:
+                return
+    if _resolve_backend(backend) == "numpy":
+        for segment in _wheel_segments(a, b):
+            yield from segment.tolist()
+        return
+    if a <= 2:
+        yield 2
+    lo = max(a, 3) | 1  # first odd number >= max(a, 3)
+    base = _base_primes(math.isqrt(b))[1:]  # odd base primes
+    while lo <= b:
+        hi = min(lo + 2 * segment_size, b + 1)  # segment covers odd numbers in [lo, hi)
+        yield from _sieve_segment(lo, hi, base)
+        lo = hi | 1
+
+def segmented_sieve(n, segment_size=SEGMENT_SIZE, backend="auto"):
+    """Yield primes up to n, sieving one cache-sized odd-only segment at a time.
+
+    Memory stays bounded by the segment plus the base primes up to sqrt(n),
+    so n can go far beyond what fits in RAM as a flat list.
+    """
+    return primes_in_range(2, n, segment_size, backend)
+
+def iter_primes(start=2, segment_size=SEGMENT_SIZE):
+    """Lazily yield every prime >= start, without an upper bound."""
+    if start <= 2:
+        yield 2
+    lo = max(start, 3) | 1
+    base_limit = 0
+    base = []
+    while True:
+        hi = lo + 2 * segment_size
+        if base_limit * base_limit < hi:
+            # Grow the base primes geometrically as the sieve moves outwards
+            base_limit = max(2 * base_limit, math.isqrt(hi) + 1)
+            base = _base_primes(base_limit)[1:]
+        yield from _sieve_segment(lo, hi, base)
+        lo = hi | 1
+
+def write_primes(primes, out=None, chunk_size=4096):
+    """Stream primes to out as space-separated text in buffered chunks.
+
+    Each chunk is flushed as soon as it is written so a downstream pipe sees
+    the first primes immediately. Returns the number of primes written.
+    """
+    if out is None:
+        out = sys.stdout
+    count = 0
+    sep = ""
+    for chunk in _chunked(primes, chunk_size):
+        out.write(sep + " ".join(map(str, chunk)))
+        out.flush()
+        sep = " "
+        count += len(chunk)
+    out.write("\n")
+    return count
+
+# --- NumPy wheel backend ---
+
+BACKENDS = ("auto", "numpy", "python")
+
+# Residues mod 30 coprime to 2, 3 and 5: the wheel keeps 8 of every 30 numbers
+_WHEEL = (1, 7, 11, 13, 17, 19, 23, 29)
+
+# Wheel rows (30 numbers, 8 flags each) per NumPy segment: 2 MiB of flags.
+# Larger than the pure-Python segment because each slice call costs more.
+WHEEL_SEGMENT_ROWS = 1 << 18
+
+def _resolve_backend(backend):
+    """Map "auto" to "numpy" when NumPy is importable, else "python"."""
+    if backend not in BACKENDS:
+        raise ValueError("unknown backend {!r}".format(backend))
+    if backend == "auto":
+        return "numpy" if np is not None else "python"
+    if backend == "numpy" and np is None:
+        raise ValueError("the numpy backend needs NumPy: pip install numpy")
+    return backend
+
+def _wheel_segments(a, b, rows=WHEEL_SEGMENT_ROWS):
+    """Yield NumPy int64 arrays of the primes in [a, b], one wheel segment at a time.
+
+    Each segment is an (8, rows) flag array where cell (i, k) stands for
+    30*k + _WHEEL[i]; multiples of 2, 3 and 5 are never stored, and every
+    base prime is crossed off with one strided slice per wheel residue.
+    """
+    small = np.array([p for p in (2, 3, 5) if a <= p <= b], dtype=np.int64)
+    if len(small):
+        yield small
+    residues = np.array(_WHEEL, dtype=np.int64)
+    base = _base_primes(math.isqrt(b))[3:]  # base primes >= 7
+    k = a // 30
+    while 30 * k <= b:
+        k_end = min(k + rows, b // 30 + 1)
+        lo, hi = 30 * k, 30 * k_end
+        flags = np.ones((8, k_end - k), dtype=bool)
+        if k == 0:
+            flags[0, 0] = False  # 1 is not prime
+        for p in base:
+            if p * p >= hi:
+                break
+            inv = pow(p % 30, -1, 30)
+            q_min = max(p, -(-lo // p))
+            for i, r in enumerate(_WHEEL):
+                # Multiples p*q land in residue row i exactly when q = r/p (mod 30)
+                q = q_min + (r * inv - q_min) % 30
+                m = p * q
+                if m < hi:
+                    flags[i, (m - lo) // 30::p] = False
+        idx = np.flatnonzero(flags.T)  # row-major over k keeps the primes sorted
+        primes = 30 * (k + idx // 8) + residues[idx % 8]
+        if 30 * k < a or hi > b:
+            primes = primes[(primes >= a) & (primes <= b)]
+        yield primes
+        k = k_end
+
+def sieve_of_eratosthenes(n, backend="auto"):
+    """Generate primes up to n using a segmented Sieve.
+
+    Returns a list with the "python" backend and a NumPy int64 array with the
+    "numpy" backend ("auto" picks numpy when it is installed).
+    """
+    if _resolve_backend(backend) == "python":
+        return list(segmented_sieve(n, backend="python"))
+    if _prime_cache is not None:
+        return np.fromiter(segmented_sieve(n, backend="numpy"), dtype=np.int64)
+    segments = list(_wheel_segments(2, n))
+    return np.concatenate(segments) if segments else np.zeros(0, dtype=np.int64)
+
+# --- Persistent prime cache ---
+
+# Byte value -> flag per bit (least significant bit first), used to unpack the cache
+_ASCII_TO_FLAG = bytes.maketrans(b"01", b"\x00\x01")
+_FLAG_TO_ASCII = bytes.maketrans(b"\x00\x01", b"01")
+
+class PrimeCache:
+    """Bit-packed odd-only sieve stored on disk and read through mmap.
+
+    The file is a 16-byte header (magic, version, body length) followed by
+    one bit per odd number: bit k of byte j says whether 16*j + 2*k + 1 is
+    prime. The cache grows by sieving only the numbers past its current end
+    and appending them, up to max_limit.
+    """
+
+    MAGIC = b"PRMC"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHxxQ")
+
+    def __init__(self, path, max_limit):
+        self.path = path
+        self.max_limit = max_limit
+        self._mmap = None
+        self._nbytes = 0
+        if not os.path.exists(path):
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION, 0))
+        self._open()
+
+    def _open(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        with open(self.path, "rb") as f:
+            header = f.read(self.HEADER.size)
+            if len(header) < self.HEADER.size:
+                raise ValueError("{}: not a prime cache file".format(self.path))
+            magic, version, nbytes = self.HEADER.unpack(header)
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError("{}: not a prime cache file".format(self.path))
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._nbytes = min(nbytes, len(self._mmap) - self.HEADER.size)
+
+    @property
+    def limit(self):
+        """Every integer <= limit is classified by the cache."""
+        return 16 * self._nbytes
+
+    def ensure(self, n):
+        """Grow the cache to cover n (capped at max_limit). Returns the covered limit."""
+        target = min(n, self.max_limit)
+        if target <= self.limit:
+            return self.limit
+        nbytes = -(-target // 16)
+        base = _base_primes(math.isqrt(16 * nbytes))[1:]
+        step = 2 * SEGMENT_SIZE  # integers per segment; a multiple of 16
+        self.close()  # some platforms refuse to resize a mapped file
+        with open(self.path, "r+b") as f:
+            f.seek(self.HEADER.size + self._nbytes)
+            lo = 16 * self._nbytes + 1
+            while lo <= 16 * nbytes:
+                hi = min(lo + step, 16 * nbytes + 1)
+                flags = _segment_flags(lo, hi, base)
+                # Reverse so the first flag lands in the least significant bit
+                bits = int(flags[::-1].translate(_FLAG_TO_ASCII), 2)
+                f.write(bits.to_bytes(len(flags) // 8, "little"))
+                lo = hi
+            f.truncate()
+            f.flush()
+            # Only publish the new length once the body is on disk
+            f.seek(0)
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, nbytes))
+        self._open()
+        return self.limit
+
+    def is_prime(self, n):
+        """Bit lookup for 2 < n <= limit (callers handle the rest)."""
+        if n % 2 == 0:
+            return n == 2
+        k = n // 2
+        return bool(self._mmap[self.HEADER.size + k // 8] >> (k % 8) & 1)
+
+    def primes(self, a, b):
+        """Yield primes in [a, b] straight from the mapped file (b <= limit)."""
+        if a <= 2 <= b:
+            yield 2
+        a = max(a, 3)
+        block = 1 << 14  # bytes decoded at a time
+        first, last = a // 16, min(b // 16, self._nbytes - 1)
+        for j in range(first, last + 1, block):
+            chunk = self._mmap[self.HEADER.size + j:self.HEADER.size + min(j + block, last + 1)]
+            nbits = 8 * len(chunk)
+            bits = bin(int.from_bytes(chunk, "little") | (1 << nbits))[3:]
+            flags = bits[::-1].encode().translate(_ASCII_TO_FLAG)
+            for p in itertools.compress(range(16 * j + 1, 16 * (j + len(chunk)), 2), flags):
+                if p > b:
+                    return
+                if p >= a:
+                    yield p
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+# Opened by open_prime_cache(); None means every call sieves from scratch
+_prime_cache = None
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "primes_toolkit", "primes.bin")
+DEFAULT_CACHE_LIMIT = 10**9
+
+def open_prime_cache(path=None, max_limit=None):
+    """Use an on-disk prime cache for sieving and primality lookups.
+
+    path and max_limit default to $PRIMES_CACHE / $PRIMES_CACHE_LIMIT, then
+    to DEFAULT_CACHE_PATH / DEFAULT_CACHE_LIMIT.
+    """
+    global _prime_cache
+    path = path or os.environ.get("PRIMES_CACHE") or DEFAULT_CACHE_PATH
+    if max_limit is None:
+        max_limit = int(os.environ.get("PRIMES_CACHE_LIMIT", DEFAULT_CACHE_LIMIT))
+    if _prime_cache is not None:
+        _prime_cache.close()
+    _prime_cache = PrimeCache(path, max_limit)
+    return _prime_cache
+
+# Trial division bound for factorize; every cofactor left below its square is prime
+SMALL_PRIME_LIMIT = 1 << 16
+SMALL_PRIMES = _base_primes(SMALL_PRIME_LIMIT)
+
+# Pollard-Brent iterations tried before switching to ECM, and the ECM
+# (B1, curves) schedule, roughly tuned for 10/15/20/25-digit factors.
+RHO_ITERATIONS = 1 << 16
+ECM_SCHEDULE = [(2000, 25), (11000, 90), (50000, 300), (250000, 700)]
+
+def _trial_divide(n, factors):
+    """Divide out primes from SMALL_PRIMES, appending them to factors. Returns the cofactor."""
+    for p in SMALL_PRIMES:
+        if p * p > n:
+            break
+        while n % p == 0:
+            factors.append(p)
+            n //= p
+    return n
+
+def pollard_brent(n, max_iterations=None):
+    """Find a non-trivial factor of composite n with Brent's variant of Pollard's rho.
+
+    Returns the factor, or None if max_iterations steps pass without one.
+    """
+    if n % 2 == 0:
+        return 2
+    batch = 128  # gcds are taken over products of this many differences
+    iterations = 0
+    while max_iterations is None or iterations < max_iterations:
+        y, c = random.randrange(1, n), random.randrange(1, n)
+        g, r, q = 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(batch, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += batch
+            iterations += r
+            r *= 2
+            if g == 1 and max_iterations is not None and iterations >= max_iterations:
+                return None
+        if g == n:
+            # The batch overshot the cycle; step back one element at a time
+            while True:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+                if g > 1:
+                    break
+        if g != n:
+            return g
+    return None
+
+def _ecm_ladder(k, x, z, a24, n):
+    """Montgomery ladder: return k*(x:z) on the curve with (A+2)/4 = a24."""
+    x1, z1 = x, z
+    # (x2:z2) = 2*(x:z)
+    s, d = (x + z) * (x + z) % n, (x - z) * (x - z) % n
+    t = s - d
+    x2, z2 = s * d % n, t * (d + a24 * t) % n
+    for bit in bin(k)[3:]:
+        # Differential add of the two ladder points, then double one of them
+        u = (x1 - z1) * (x2 + z2) % n
+        v = (x1 + z1) * (x2 - z2) % n
+        xa, za = z * (u + v) ** 2 % n, x * (u - v) ** 2 % n
+        if bit == "1":
+            s, d = (x2 + z2) * (x2 + z2) % n, (x2 - z2) * (x2 - z2) % n
+            t = s - d
+            x1, z1, x2, z2 = xa, za, s * d % n, t * (d + a24 * t) % n
+        else:
+            s, d = (x1 + z1) * (x1 + z1) % n, (x1 - z1) * (x1 - z1) % n
+            t = s - d
+            x1, z1, x2, z2 = s * d % n, t * (d + a24 * t) % n, xa, za
+    return x1, z1
+
+def ecm_stage1(n, b1, curves):
+    """Lenstra ECM stage 1 on Montgomery curves (Suyama parametrization).
+
+    Returns a non-trivial factor of n, or None if no curve finds one.
+    """
+    prime_powers = []
+    for p in primes_in_range(2, b1):
+        q = p
+        while q * p <= b1:
+            q *= p
+        prime_powers.append(q)
+    for _ in range(curves):
+        sigma = random.randrange(6, n - 1)
+        u, v = (sigma * sigma - 5) % n, 4 * sigma % n
+        x, z = pow(u, 3, n), pow(v, 3, n)
+        denom = 16 * x * v % n
+        g = math.gcd(denom, n)
+        if g != 1:
+            if g != n:
+                return g
+            continue
+        a24 = pow(v - u, 3, n) * (3 * u + v) * pow(denom, -1, n) % n
+        for q in prime_powers:
+            x, z = _ecm_ladder(q, x, z, a24, n)
+        g = math.gcd(z, n)
+        if 1 < g < n:
+            return g
+    return None
+
+def _iroot(n, k):
+    """Largest r with r**k <= n, by Newton's method on integers."""
+    r = 1 << -(-n.bit_length() // k)  # an upper bound to start from
+    while True:
+        s = ((k - 1) * r + n // r ** (k - 1)) // k
+        if s >= r:
+            return r
+        r = s
+
+def _find_factor(n):
+    """Return a non-trivial factor of the composite n."""
+    # ECM cannot split a prime power (Z vanishes mod p**k, not just mod p),
+    # so catch perfect powers first; only prime exponents need checking
+    for k in SMALL_PRIMES:
+        if k > n.bit_length():
+            break
+        r = _iroot(n, k)
+        if r ** k == n:
+            return r
+    d = pollard_brent(n, RHO_ITERATIONS)
+    if d:
+        return d
+    for b1, curves in ECM_SCHEDULE:
+        d = ecm_stage1(n, b1, curves)
+        if d:
+            return d
+    return pollard_brent(n)
 
 def factorize(n):
-    """Factorize n via trial division up to sqrt(n). Returns sorted list of prime factors."""
+    """Factorize n: small-prime trial division, then Pollard-Brent rho and ECM
+    on what is left. Returns sorted list of prime factors."""
     if n < 2:
         return []
     factors = []
-    # Check 2 separately
-    while n % 2 == 0:
-        factors.append(2)
-        n //= 2
-    # Odd factors up to sqrt(n)
-    for i in range(3, int(math.sqrt(n)) + 1, 2):
-        while n % i == 0:
-            factors.append(i)
-            n //= i
-    if n > 1:
+    n = _trial_divide(n, factors)
+    if n > 1 and n < SMALL_PRIME_LIMIT * SMALL_PRIME_LIMIT:
         factors.append(n)
-    return factors
+        n = 1
+    pending = [n] if n > 1 else []
+    while pending:
+        m = pending.pop()
+        if is_prime_optimized(m):
+            factors.append(m)
+            continue
+        d = _find_factor(m)
+        pending += [d, m // d]
+    return sorted(factors)
+
+# is_prime_optimized trial-divides by the primes below this bound before
+# running any modular exponentiation
+TRIAL_DIVISION_BOUND = 1000
+_TRIAL_PRIMES = SMALL_PRIMES[:bisect.bisect(SMALL_PRIMES, TRIAL_DIVISION_BOUND)]
+
+# The first twelve primes are a deterministic Miller-Rabin witness set below 2**64
+_MR_64BIT_WITNESSES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
 
 def is_prime_optimized(n):
-    """Check if n is prime: 6k±1 + Miller-Rabin for large n."""
+    """Check if n is prime: small-prime trial division, then deterministic
+    Miller-Rabin below 2**64 and Baillie-PSW above it."""
     if n <= 1:
         return False
-    if n <= 3:
+    if _prime_cache is not None and n <= _prime_cache.limit:
+        return _prime_cache.is_prime(n)
+    for p in _TRIAL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < TRIAL_DIVISION_BOUND * TRIAL_DIVISION_BOUND:
+        return True
+    if n < 2**64:
+        return miller_rabin(n, _MR_64BIT_WITNESSES)
+    # Baillie-PSW: strong base-2 test plus strong Lucas test (no known counterexample)
+    return miller_rabin(n, [2]) and strong_lucas_prp(n)
+
+def _jacobi(a, n):
+    """Jacobi symbol (a/n) for odd positive n."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+def strong_lucas_prp(n):
+    """Strong Lucas probable-prime test with Selfridge's parameters (method A)."""
+    if n == 2:
         return True
-    if n % 2 == 0 or n % 3 == 0:
+    if n < 2 or n % 2 == 0:
         return False
-    
-    # 6k±1 optimization
-    i = 5
-    while i * i <= n:
-        if n % i == 0 or n % (i + 2) == 0:
+    r = math.isqrt(n)
+    if r * r == n:
+        return False  # no suitable D exists for perfect squares
+    # D is the first of 5, -7, 9, -11, ... with (D/n) = -1
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
             return False
-        i += 6
-    
-    # Miller-Rabin for large n (deterministic up to 2^64 with these witnesses)
-    if n < 2**64:
-        witnesses = [2, 3, 5, 7, 11, 13, 17, 23, 29, 31, 37]
-    else:
-        witnesses = [2, 3, 5, 7, 11, 13, 17]  # Sufficient for most cases
-    return miller_rabin(n, witnesses)
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+    # Write n+1 as 2^s * d
+    s, d = 0, n + 1
+    while d % 2 == 0:
+        s += 1
+        d //= 2
+
+    def half(x):
+        return (x + n if x % 2 else x) // 2 % n
+
+    # Left-to-right binary chain for U_d, V_d and Q^d
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V = U * V % n, (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = half(P * U + V), half(D * U + P * V)
+            Qk = Qk * Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if V == 0:
+            return True
+    return False
 
 def miller_rabin(n, witnesses):
     """Miller-Rabin primality test."""
@@ -88,38 +634,255 @@ def miller_rabin(n, witnesses):
             return False
     return True
 
+def _lucy_python(n, r):
+    """Lucy_Hedgehog prime counting on plain lists."""
+    # small[v] = S(v) for v <= r, large[i] = S(n // i); S starts as "v - 1"
+    small = [v - 1 for v in range(r + 1)]
+    large = [0] + [n // i - 1 for i in range(1, r + 1)]
+    for p in range(2, r + 1):
+        if small[p] == small[p - 1]:
+            continue  # p is composite
+        sp, p2 = small[p - 1], p * p
+        lim = min(r, n // p2)
+        m = min(lim, r // p)  # for i <= m, n // (i*p) is itself a "large" value
+        for i in range(1, m + 1):
+            large[i] -= large[i * p] - sp
+        for i in range(m + 1, lim + 1):
+            large[i] -= small[n // (i * p)] - sp
+        for v in range(r, p2 - 1, -1):
+            small[v] -= small[v // p] - sp
+    return large[1]
+
+def _lucy_numpy(n, r):
+    """Lucy_Hedgehog prime counting with each sieving step vectorized in NumPy."""
+    small = np.arange(-1, r, dtype=np.int64)
+    large = np.zeros(r + 1, dtype=np.int64)
+    large[1:] = n // np.arange(1, r + 1, dtype=np.int64) - 1
+    for p in range(2, r + 1):
+        if small[p] == small[p - 1]:
+            continue  # p is composite
+        sp, p2 = small[p - 1], p * p
+        lim = min(r, n // p2)
+        m = min(lim, r // p)
+        # Right-hand sides are evaluated before assignment, so every update
+        # reads the values from before this prime, as the scalar loop does
+        large[1:m + 1] -= large[p:m * p + 1:p] - sp
+        if lim > m:
+            i = np.arange(m + 1, lim + 1, dtype=np.int64)
+            large[m + 1:lim + 1] -= small[n // (i * p)] - sp
+        if p2 <= r:
+            small[p2:] -= small[np.arange(p2, r + 1) // p] - sp
+    return int(large[1])
+
+def prime_count(n, backend="auto"):
+    """Return pi(n), the number of primes <= n, with the Lucy_Hedgehog method.
+
+    Runs in about O(n^(3/4)) time and O(sqrt(n)) memory without enumerating
+    any primes; each step is vectorized with the numpy backend.
+    """
+    if n < 2:
+        return 0
+    r = math.isqrt(n)
+    if _resolve_backend(backend) == "numpy":
+        return _lucy_numpy(n, r)
+    return _lucy_python(n, r)
+
+def _li(x):
+    """Logarithmic integral li(x) by Ramanujan's series."""
+    ln = math.log(x)
+    total, term, inner = 0.0, 1.0, 0.0
+    for k in range(1, 200):
+        term *= ln / k
+        if (k - 1) % 2 == 0:
+            inner += 1.0 / k
+        step = (-1 if k % 2 == 0 else 1) * term / 2 ** (k - 1) * inner
+        total += step
+        if abs(step) < 1e-17 * abs(total):
+            break
+    return 0.5772156649015329 + math.log(ln) + math.sqrt(x) * total
+
+def nth_prime(k, backend="auto"):
+    """Return the k-th prime (nth_prime(1) == 2).
+
+    li(x) is inverted to land close to the answer, pi(x) is counted there
+    exactly, and only the short window between x and the k-th prime is sieved.
+    """
+    if k < 1:
+        raise ValueError("k must be >= 1")
+    if k < 1000:
+        return next(itertools.islice(iter_primes(), k - 1, None))
+    # Newton's method on li(x) = k; li'(x) = 1 / ln(x)
+    x = k * math.log(k)
+    for _ in range(50):
+        step = (_li(x) - k) * math.log(x)
+        x -= step
+        if abs(step) < 1:
+            break
+    x = int(x)
+    count = prime_count(x, backend)
+    if count < k:
+        return next(itertools.islice(iter_primes(x + 1), k - count - 1, None))
+    # The k-th prime is at or below x: sieve backwards in windows
+    width = max(1 << 16, 4 * math.isqrt(x))
+    hi = x
+    while True:
+        lo = max(2, hi - width)
+        window = list(primes_in_range(lo, hi, backend=backend))
+        if count - len(window) < k:
+            return window[len(window) - 1 - (count - k)]
+        count -= len(window)
+        hi = lo - 1
+
+def _format_factors(n, factors):
+    """Render a factorization the way the factor command prints it."""
+    if not factors:
+        return "{} (no prime factors)".format(n)
+    return "{} = {}".format(n, " × ".join(map(str, factors)))
+
+def _isprime_chunk(numbers):
+    """Worker task: primality verdicts for a chunk of integers."""
+    return ["{} {}".format(n, "Yes" if is_prime_optimized(n) else "No") for n in numbers]
+
+def _factor_chunk(numbers):
+    """Worker task: factorizations for a chunk of integers."""
+    return [_format_factors(n, factorize(n)) for n in numbers]
+
+def read_integers(stream):
+    """Yield whitespace-separated integers from a text stream, line by line."""
+    for line in stream:
+        for token in line.split():
+            try:
+                yield int(token)
+            except ValueError:
+                raise ValueError("invalid integer {!r}".format(token)) from None
+
+def run_batch(numbers, task, out=None, workers=None, chunk_size=1000):
+    """Apply task to numbers across a process pool, writing results in input order.
+
+    numbers is consumed lazily in chunks and at most two chunks per worker are
+    in flight, so memory stays flat for inputs of any length. Workers are
+    forked where possible so they inherit SMALL_PRIMES instead of rebuilding it.
+    """
+    if out is None:
+        out = sys.stdout
+    workers = workers or os.cpu_count() or 1
+    context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    pending = collections.deque()
+    chunks = _chunked(numbers, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        for chunk in chunks:
+            pending.append(pool.submit(task, chunk))
+            if len(pending) >= 2 * workers:
+                out.write("\n".join(pending.popleft().result()) + "\n")
+        while pending:
+            out.write("\n".join(pending.popleft().result()) + "\n")
+    out.flush()
+
+def _open_batch_input(path):
+    """Open a --batch argument, where '-' means stdin."""
+    return sys.stdin if path == "-" else open(path)
+
 def main():
     parser = argparse.ArgumentParser(description="Prime Number Toolkit CLI")
+    parser.add_argument("--cache", nargs="?", const="", metavar="PATH",
+                        help="Use an on-disk prime cache (default: $PRIMES_CACHE or ~/.cache)")
+    parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                        help="Sieve/counting backend (default: numpy when installed)")
+    parser.add_argument("--cache-limit", type=int, metavar="N",
+                        help="Largest number the cache may grow to (default: 10**9)")
     subparsers = parser.add_subparsers(dest="command", help="Available commands", required=True)
     
     # gen subparser
-    gen_parser = subparsers.add_parser("gen", help="Generate primes up to N")
-    gen_parser.add_argument("N", type=int, help="Upper limit")
+    gen_parser = subparsers.add_parser("gen", help="Generate primes up to N, or in [A, B]")
+    gen_parser.add_argument("N", type=int, nargs="?", help="Upper limit (same as --to N)")
+    gen_parser.add_argument("--from", dest="start", type=int, default=2, metavar="A",
+                            help="Lower end of the range (with N or --to)")
+    gen_parser.add_argument("--to", type=int, metavar="B", help="Upper end of the range")
     
     # factor subparser
     factor_parser = subparsers.add_parser("factor", help="Factorize N")
-    factor_parser.add_argument("N", type=int, help="Number to factorize")
+    factor_parser.add_argument("N", type=int, nargs="?", help="Number to factorize")
     
     # isprime subparser
     isprime_parser = subparsers.add_parser("isprime", help="Check if N is prime")
-    isprime_parser.add_argument("N", type=int, help="Number to check")
+    isprime_parser.add_argument("N", type=int, nargs="?", help="Number to check")
+    
+    # count subparser
+    count_parser = subparsers.add_parser("count", help="Count primes <= N")
+    count_parser.add_argument("N", type=int, help="Upper limit")
+    
+    # nth subparser
+    nth_parser = subparsers.add_parser("nth", help="Find the K-th prime")
+    nth_parser.add_argument("K", type=int, help="Index of the prime (1 = 2)")
+    
+    # Batch options shared by factor and isprime
+    for sub in (factor_parser, isprime_parser):
+        sub.add_argument("--batch", metavar="FILE", help="Read integers from FILE ('-' for stdin)")
+        sub.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+        sub.add_argument("--chunk-size", type=int, default=1000, help="Integers per worker task")
     
     args = parser.parse_args()
+    try:
+        _resolve_backend(args.backend)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if args.cache is not None or os.environ.get("PRIMES_CACHE"):
+        try:
+            open_prime_cache(args.cache, args.cache_limit)
+        except (OSError, ValueError) as e:
+            print("Error: {}".format(e), file=sys.stderr)
+            sys.exit(1)
     
     if args.command == "gen":
-        if args.N > 10**7:  # Reasonable limit for CLI
-            print("Error: N too large (max 10M for performance)", file=sys.stderr)
+        if args.N is not None and args.to is not None:
+            parser.error("gen takes N or --to B, not both")
+        if args.N is None and args.to is None:
+            parser.error("gen requires N or --to B")
+        lo, hi = args.start, args.N if args.N is not None else args.to
+        # Primes are streamed segment by segment, so there is no upper limit
+        # and memory stays flat; the count is only known at the end.
+        if lo <= 2:
+            print("Primes up to {}:".format(hi), flush=True)
+        else:
+            print("Primes in [{}, {}]:".format(lo, hi), flush=True)
+        try:
+            count = write_primes(primes_in_range(lo, hi, backend=args.backend))
+            print("({} primes)".format(count))
+        except BrokenPipeError:
+            # Downstream closed the pipe (e.g. `| head`); stop quietly
+            sys.stdout = open(os.devnull, "w")
+            sys.exit(0)
+    
+    elif args.command == "count":
+        print("pi({}) = {}".format(args.N, prime_count(args.N, args.backend)))
+    
+    elif args.command == "nth":
+        if args.K < 1:
+            parser.error("K must be >= 1")
+        print("prime({}) = {}".format(args.K, nth_prime(args.K, args.backend)))
+    
+    elif args.batch is not None:
+        task = _factor_chunk if args.command == "factor" else _isprime_chunk
+        try:
+            with _open_batch_input(args.batch) as stream:
+                run_batch(read_integers(stream), task, workers=args.workers,
+                          chunk_size=args.chunk_size)
+        except (OSError, ValueError) as e:
+            print("Error: {}".format(e), file=sys.stderr)
             sys.exit(1)
-        primes = sieve_of_eratosthenes(args.N)
-        print("Primes up to {} ({} primes):".format(args.N, len(primes)))
-        print(" ".join(map(str, primes)))
+    
+    elif args.N is None:
+        parser.error("{} requires N or --batch FILE".format(args.command))
     
     elif args.command == "factor":
         factors = factorize(args.N)
         if not factors:
             print("1 (no prime factors)")
         else:
-            print("{} = {}".format(args.N, " × ".join(map(str, factors))))
+            print(_format_factors(args.N, factors))
     
     elif args.command == "isprime":
         result = is_prime_optimized(args.N)